@@ -115,6 +115,10 @@ def crawl(
         None, "--cookie", "-c",
         help="Cookie in format 'name=value' (can be repeated)"
     ),
+    session_file: Optional[str] = typer.Option(
+        None, "--session-file",
+        help="File to save/restore the browser session so later runs can skip login"
+    ),
     
     # Crawl options
     max_pages: int = typer.Option(
@@ -127,7 +131,11 @@ def crawl(
     ),
     wait_time: int = typer.Option(
         2000, "--wait-time", "-w",
-        help="Time to wait after page load (milliseconds)"
+        help="Max time to wait after page load for API calls to settle (milliseconds)"
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency",
+        help="Number of pages to crawl in parallel (max 8)"
     ),
     
     # Output options
@@ -153,7 +161,11 @@ def crawl(
     ),
     exclude: Optional[List[str]] = typer.Option(
         None, "--exclude", "-e",
-        help="Regex pattern for URLs to exclude (can be repeated)"
+        help="Regex pattern for API URLs to exclude from capture (can be repeated)"
+    ),
+    exclude_page: Optional[List[str]] = typer.Option(
+        None, "--exclude-page",
+        help="Regex pattern for pages the crawler should not visit (can be repeated)"
     ),
 ):
     """
@@ -214,12 +226,16 @@ def crawl(
             for c in cookie:
                 name, value = parse_cookie(c)
                 loaded_config.cookies[name] = value
+        if session_file:
+            loaded_config.session_file = session_file
         if max_pages != 50:  # Not default
             loaded_config.max_pages = max_pages
         if max_depth != 3:
             loaded_config.max_depth = max_depth
         if wait_time != 2000:
             loaded_config.wait_time = wait_time
+        if concurrency != 1:
+            loaded_config.concurrency = concurrency
         if not headless:
             loaded_config.headless = headless
         if output != "./api-docs":
@@ -230,6 +246,8 @@ def crawl(
             loaded_config.include_patterns = list(include)
         if exclude:
             loaded_config.exclude_patterns = list(exclude)
+        if exclude_page:
+            loaded_config.exclude_page_patterns = list(exclude_page)
         
         config = loaded_config
     else:
@@ -262,9 +280,11 @@ def crawl(
             password_field=password_field,
             auth_headers=auth_headers,
             cookies=cookies,
+            session_file=session_file,
             max_pages=max_pages,
             max_depth=max_depth,
             wait_time=wait_time,
+            concurrency=concurrency,
             headless=headless,
             output_dir=output,
             output_format=format,
@@ -276,6 +296,7 @@ def crawl(
                 r".*/__webpack_hmr.*",
                 r".*/favicon\.ico$",
             ],
+            exclude_page_patterns=list(exclude_page) if exclude_page else [],
         )
     
     # Save profile if requested
@@ -14,5 +14,12 @@ if __name__ == "__main__":
         host="127.0.0.1",
         port=8787,
         reload=False,
+        # Crawl/record state, the browser and WebSocket clients live in this
+        # process, so the UI must run as a single worker
+        workers=1,
         log_level="warning",
+        loop="auto",  # uvloop when installed, asyncio otherwise
+        ws_ping_interval=20,  # WebSocket keepalive handled by the protocol layer
+        ws_ping_timeout=20,
+        ws_per_message_deflate=True,  # Compress large endpoint-list frames on the wire
     )
@@ -48,6 +48,9 @@ NON_API_PATTERNS = [
     r"\.(css|js|map|ico|png|jpg|jpeg|gif|svg|woff|woff2|ttf|eot)(\?.*)?$",
 ]
 
+# All non-API patterns as one alternation, searched once per endpoint
+NON_API_RE = re.compile("|".join(f"(?:{p})" for p in NON_API_PATTERNS), re.I)
+
 
 class EndpointAnalyzer:
     """Analyzes captured endpoints and infers schemas."""
@@ -104,9 +107,8 @@ class EndpointAnalyzer:
             return True
         
         # Check against non-API patterns
-        for pattern in NON_API_PATTERNS:
-            if re.search(pattern, path, re.I):
-                return False
+        if NON_API_RE.search(path):
+            return False
         
         # Check content type - JSON responses are likely APIs
         if endpoint.response.content_type == ContentType.JSON:
@@ -279,6 +281,8 @@ class EndpointAnalyzer:
         # Find {id} placeholders and infer original values
         original_parts = path.split("/")
         normalized_parts = normalized.split("/")
+        # Split every endpoint's path once, not twice per placeholder
+        endpoint_parts = [ep.request.parsed_url["path"].split("/") for ep in endpoints]
         
         for i, (orig, norm) in enumerate(zip(original_parts, normalized_parts)):
             if norm == "{id}" and orig != "{id}":
@@ -288,11 +292,7 @@ class EndpointAnalyzer:
                     required=True,
                     schema_type=self._infer_type(orig),
                     example=orig,
-                    examples=list(set(
-                        ep.request.parsed_url["path"].split("/")[i]
-                        for ep in endpoints
-                        if len(ep.request.parsed_url["path"].split("/")) > i
-                    ))[:5],
+                    examples=list({parts[i] for parts in endpoint_parts if len(parts) > i})[:5],
                 )
                 # Check if already added
                 if not any(p.name == "id" and p.location == ParameterLocation.PATH for p in parameters):
@@ -336,18 +336,19 @@ class EndpointAnalyzer:
         if not bodies:
             return None
         
-        # Use first body as example
-        content_type, body = bodies[0]
+        # Use first body as example; each body is parsed only once
+        content_type = bodies[0][0]
+        examples = [self._parse_body(b, ct) for ct, b in bodies[:3]]
+        parsed = examples[0]
         
         request_body = RequestBody(
             content_type=content_type,
-            example=self._parse_body(body, content_type),
-            examples=[self._parse_body(b, ct) for ct, b in bodies[:3]],
+            example=parsed,
+            examples=examples,
         )
         
         # Infer schema from JSON bodies
         if content_type == ContentType.JSON:
-            parsed = self._parse_body(body, content_type)
             if isinstance(parsed, dict):
                 request_body.schema_properties = self._infer_object_schema(parsed)
         
@@ -368,20 +369,20 @@ class EndpointAnalyzer:
             response = ResponseBody(
                 status_code=status_code,
                 content_type=first.response.content_type,
-                headers=dict(first.response.headers),
+                headers=first.response.headers,  # Validation already builds a new dict
             )
             
             # Parse body
             if first.response.body:
-                parsed = self._parse_body(first.response.body, first.response.content_type)
-                response.example = parsed
-                
-                # Collect multiple examples
+                # Collect multiple examples; the first one is this response's
+                # own body, so it doubles as the example without a second parse
                 response.examples = [
                     self._parse_body(ep.response.body, ep.response.content_type)
                     for ep in status_endpoints[:3]
                     if ep.response.body
                 ]
+                parsed = response.examples[0]
+                response.example = parsed
                 
                 # Infer schema from JSON
                 if first.response.content_type == ContentType.JSON and isinstance(parsed, dict):
@@ -24,13 +24,17 @@ def set_2fa_callback(callback: Optional[Callable[[str], Awaitable[str]]]):
     _2fa_callback = callback
 
 
+# Path segments that mean a request ended up on a login page
+LOGIN_PATH_SEGMENTS = frozenset({"login", "signin", "sign-in", "auth"})
+
+
 class AuthHandler:
     """Handles various authentication methods."""
     
     def __init__(self, config: CrawlConfig):
         self.config = config
     
-    async def setup_auth(self, context: BrowserContext, page: Page) -> bool:
+    async def setup_auth(self, context: BrowserContext, page: Page, restored_session: bool = False) -> bool:
         """Set up authentication based on config. Returns True if successful."""
         
         success = True
@@ -45,10 +49,47 @@ class AuthHandler:
         
         # Perform form login if credentials provided
         if self.config.login_url and self.config.username and self.config.password:
-            success = await self._perform_login(page)
+            # Extra headers aren't part of a saved storage state, so only the
+            # form login can be skipped when a restored session is still valid
+            if restored_session and await self._session_is_valid(page):
+                console.print("[green]✓[/] Reusing saved session, skipping login")
+            else:
+                success = await self._perform_login(page)
         
         return success
     
+    async def _session_is_valid(self, page: Page) -> bool:
+        """Check whether the current session can reach the start URL without logging in."""
+        try:
+            response = await page.goto(self.config.start_url, wait_until="domcontentloaded", timeout=30000)
+        except Exception:
+            return False
+        
+        if response and response.status in (401, 403):
+            return False
+        
+        # Redirected to the login page (match whole path segments, so /authors
+        # or an oauth-app host don't count as a login redirect)
+        current = urlparse(page.url)
+        if self.config.login_url:
+            login = urlparse(self.config.login_url)
+            if current.netloc == login.netloc and current.path.rstrip("/") == login.path.rstrip("/"):
+                return False
+        segments = {segment.lower() for segment in current.path.split("/")}
+        if segments & LOGIN_PATH_SEGMENTS:
+            return False
+        
+        # A stale session may render the login form in place without redirecting
+        password_selector = self.config.password_field or await self._find_password_field(page)
+        if password_selector:
+            try:
+                if await page.is_visible(password_selector):
+                    return False
+            except Exception:
+                pass
+        
+        return True
+    
     async def _set_cookies(self, context: BrowserContext):
         """Set cookies on the browser context."""
         parsed = urlparse(self.config.start_url)
@@ -740,27 +781,52 @@ class AuthHandler:
     
     async def _find_submit_button(self, page: Page) -> Optional[str]:
         """Auto-detect the login submit button."""
-        selectors = [
-            'button[type="submit"]',
-            'input[type="submit"]',
-            'button:has-text("Log in")',
-            'button:has-text("Login")',
-            'button:has-text("Sign in")',
-            'button:has-text("Sign In")',
-            'button:has-text("Submit")',
-            '[class*="login"] button',
-            '[class*="submit"]',
-            'form button:last-of-type',
+        # Candidates in priority order. Plain CSS is matched with querySelector,
+        # text candidates mirror Playwright's case-insensitive :has-text().
+        candidates = [
+            {"css": 'button[type="submit"]'},
+            {"css": 'input[type="submit"]'},
+            {"text": "Log in"},
+            {"text": "Login"},
+            {"text": "Sign in"},
+            {"text": "Sign In"},
+            {"text": "Submit"},
+            {"css": '[class*="login"] button'},
+            {"css": '[class*="submit"]'},
+            {"css": 'form button:last-of-type'},
         ]
         
-        for selector in selectors:
-            try:
-                elem = await page.query_selector(selector)
-                if elem:
-                    is_visible = await elem.is_visible()
-                    if is_visible:
-                        return selector
-            except Exception:
-                pass
+        # Resolve every candidate in a single round-trip instead of one per selector
+        try:
+            match = await page.evaluate("""
+                (candidates) => {
+                    const isVisible = (el) => {
+                        const rect = el.getBoundingClientRect();
+                        return rect.width > 0 && rect.height > 0 &&
+                            getComputedStyle(el).visibility !== 'hidden';
+                    };
+                    const buttons = Array.from(document.querySelectorAll('button'));
+                    for (let i = 0; i < candidates.length; i++) {
+                        const c = candidates[i];
+                        let el = null;
+                        if (c.css) {
+                            try { el = document.querySelector(c.css); } catch (e) {}
+                        } else {
+                            const needle = c.text.toLowerCase();
+                            el = buttons.find(b => (b.textContent || '').toLowerCase().includes(needle)) || null;
+                        }
+                        if (el && isVisible(el)) return i;
+                    }
+                    return null;
+                }
+            """, candidates)
+        except Exception:
+            return None
         
-        return None
+        if match is None:
+            return None
+        
+        candidate = candidates[match]
+        if "css" in candidate:
+            return candidate["css"]
+        return f'button:has-text("{candidate["text"]}")'
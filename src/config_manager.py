@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 import os
+import string
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
@@ -18,18 +20,42 @@ console = Console()
 # Default config directory
 CONFIG_DIR = Path.home() / ".api-endpoint-hunter" / "profiles"
 
+# Set once the config directory has been created, so we only mkdir once
+_config_dir_ready = False
+
+# Translation table mapping every disallowed ASCII character to "_"
+_ALLOWED_NAME_CHARS = set(string.ascii_letters + string.digits + "-_")
+_NAME_TRANS = str.maketrans({chr(i): "_" for i in range(128) if chr(i) not in _ALLOWED_NAME_CHARS})
+
 
 def get_config_dir() -> Path:
     """Get the configuration directory, creating it if needed."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    global _config_dir_ready
+    if not _config_dir_ready:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _config_dir_ready = True
     return CONFIG_DIR
 
 
+@lru_cache(maxsize=256)
+def _safe_name(name: str) -> str:
+    """Sanitize a profile name for use as a filename."""
+    if name.isascii():
+        return name.translate(_NAME_TRANS)
+    # Non-ASCII names keep unicode letters/digits, so fall back to the slow path
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+
+
+@lru_cache(maxsize=256)
+def _profile_path(name: str) -> Path:
+    """Build (and cache) the profile file path for a name."""
+    return Path(f"{CONFIG_DIR}{os.sep}{_safe_name(name)}.json")
+
+
 def get_profile_path(name: str) -> Path:
     """Get the path for a profile by name."""
-    # Sanitize name for filesystem
-    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
-    return get_config_dir() / f"{safe_name}.json"
+    get_config_dir()
+    return _profile_path(name)
 
 
 def save_profile(name: str, config: CrawlConfig, description: str = "") -> Path:
@@ -37,11 +63,12 @@ def save_profile(name: str, config: CrawlConfig, description: str = "") -> Path:
     profile_path = get_profile_path(name)
     
     # Convert config to dict, excluding sensitive defaults
+    now = datetime.now().isoformat()
     config_dict = {
         "name": name,
         "description": description,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": now,
+        "updated_at": now,
         "config": {
             "start_url": config.start_url,
             "login_url": config.login_url,
@@ -51,14 +78,20 @@ def save_profile(name: str, config: CrawlConfig, description: str = "") -> Path:
             "password_field": config.password_field,
             "auth_headers": config.auth_headers,
             "cookies": config.cookies,
+            "session_file": config.session_file,
             "max_pages": config.max_pages,
             "max_depth": config.max_depth,
             "wait_time": config.wait_time,
+            "concurrency": config.concurrency,
             "headless": config.headless,
             "output_dir": config.output_dir,
             "output_format": config.output_format,
+            "snapshot_format": config.snapshot_format,
+            "snapshot_quality": config.snapshot_quality,
+            "blocked_resource_types": config.blocked_resource_types,
             "include_patterns": config.include_patterns,
             "exclude_patterns": config.exclude_patterns,
+            "exclude_page_patterns": config.exclude_page_patterns,
         }
     }
     
@@ -102,13 +135,17 @@ def list_profiles() -> list[dict]:
     config_dir = get_config_dir()
     profiles = []
     
-    for file_path in config_dir.glob("*.json"):
+    # scandir yields names and file types from a single directory read
+    with os.scandir(config_dir) as it:
+        entries = [e for e in it if e.name.endswith(".json") and e.is_file(follow_symlinks=False)]
+    
+    for entry in entries:
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            with open(entry.path, "rb") as f:
+                data = json.loads(f.read())
             
             profiles.append({
-                "name": data.get("name", file_path.stem),
+                "name": data.get("name", entry.name[:-len(".json")]),
                 "description": data.get("description", ""),
                 "url": data.get("config", {}).get("start_url", ""),
                 "created_at": data.get("created_at", ""),
@@ -3,20 +3,24 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import heapq
+import itertools
+import json
 import os
 import re
-from collections import deque
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Set, Callable, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 from .models import CrawlConfig, CrawlResult, CapturedEndpoint
-from .interceptor import APIInterceptor
+from .interceptor import APIInterceptor, compile_pattern_union, literal_prefixes
 from .auth import AuthHandler
 
 console = Console()
@@ -24,6 +28,76 @@ console = Console()
 # Callback type for snapshot notifications
 SnapshotCallback = Callable[[str, str, int], None]  # (screenshot_path, url, page_num)
 
+# Upper bound on parallel crawl pages; beyond this, page loads start timing out
+MAX_CONCURRENCY = 8
+
+# Entries kept in the per-crawler _should_visit memo before it is reset
+CRAWLABLE_CACHE_SIZE = 65536
+
+# Screenshot writes allowed in flight before a snapshot waits for one to land,
+# so a fast crawl can't pile up encoded images in memory faster than disk drains them
+MAX_PENDING_SNAPSHOT_WRITES = 8
+
+# File types that are never worth crawling
+SKIP_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico",
+    ".css", ".js", ".woff", ".woff2", ".ttf", ".eot",
+    ".pdf", ".zip", ".tar", ".gz", ".mp4", ".mp3",
+})
+
+
+def _write_all(fd: int, data) -> None:
+    """Write a whole buffer to a file descriptor without copying it."""
+    with memoryview(data) as view:
+        offset = 0
+        while offset < len(view):
+            offset += os.write(fd, view[offset:])
+
+
+def _write_file(path: str, data) -> None:
+    """Write bytes to a file with raw os.write calls, bypassing Python file objects."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=8192)
+def _parse_url(url: str):
+    """Parse a URL, caching the result since the same links recur across pages."""
+    return urlparse(url)
+
+
+@lru_cache(maxsize=8192)
+def normalize_url(url: str) -> str:
+    """Normalize URL for deduplication."""
+    # Fast path for plain http(s) URLs: split with str.partition instead of
+    # building a urlparse result. Anything unusual (path params, odd scheme
+    # casing) goes through urlparse as before.
+    if url.startswith(("http://", "https://")):
+        base, _, query = url.partition("#")[0].partition("?")
+        if ";" not in base:
+            if query:
+                if "&" in query:
+                    query = "&".join(sorted(query.split("&")))
+                base = f"{base}?{query}"
+            return base.rstrip("/")
+    
+    parsed = _parse_url(url)
+    # Remove fragment and normalize
+    normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        # Sort query params for consistent deduplication
+        params = sorted(parsed.query.split("&"))
+        normalized += "?" + "&".join(params)
+    return normalized.rstrip("/")
+
+
+def url_digest(normalized: str) -> bytes:
+    """Fixed-size 8-byte key for a normalized URL in the visited/queued sets."""
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
 
 class Crawler:
     """Crawls websites and captures API endpoints."""
@@ -32,9 +106,21 @@ class Crawler:
         self.config = config
         self.interceptor = APIInterceptor(config)
         self.auth_handler = AuthHandler(config)
-        self.visited_urls: Set[str] = set()
-        self.urls_to_visit: deque[tuple[str, int]] = deque()  # (url, depth)
+        self.visited_urls: Set[bytes] = set()  # url_digest() of each normalized URL crawled
+        self.pages_visited: list[str] = []  # Normalized URLs crawled, for the result
+        self._raw_visited: Set[str] = set()  # Un-normalized URLs already crawled
+        self._crawlable_cache: dict[str, bool] = {}  # Memoized _is_crawlable results
+        # Frontier heap of (priority, sequence, url, depth); see _enqueue for priority
+        self._frontier: list[tuple[int, int, str, int]] = []
+        self._frontier_seq: int = 0  # Tie-breaker keeping FIFO order within a priority
+        self._segment_counts: dict[str, int] = {}  # Pages crawled per first path segment
+        # url_digest() of every URL ever enqueued; the URL strings themselves
+        # are dropped once their frontier entry is popped
+        self._queued_keys: Set[bytes] = set()
         self.current_page_url: str = ""
+        self._page_urls: dict[Page, str] = {}  # URL each worker page is currently crawling
+        self._active_workers: int = 0
+        self._frontier_changed = asyncio.Event()
         self.errors: list[str] = []
         self.snapshots: list[dict] = []  # List of {path, url, page_num, timestamp}
         self.snapshot_callback: Optional[SnapshotCallback] = None
@@ -42,11 +128,20 @@ class Crawler:
         # Create snapshots directory
         self.snapshots_dir = Path(config.output_dir) / "snapshots"
         self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        self._snapshots_prefix = str(self.snapshots_dir) + os.sep  # For cheap path concatenation
+        self._snapshot_index_file = None  # NDJSON log, opened on first snapshot
+        self._snapshot_writes: set[asyncio.Task] = set()  # Screenshot writes still in flight
+        self._snapshot_seq = itertools.count()  # Unique per snapshot, even across concurrent workers
         
         # Parse base domain for same-origin filtering
         parsed = urlparse(config.start_url)
         self.base_domain = parsed.netloc
         self.base_scheme = parsed.scheme
+        self._origin_prefix = f"{self.base_scheme}://{self.base_domain}"
+        
+        # Pages matching an exclude pattern are never navigated to
+        self._exclude_re = compile_pattern_union(config.exclude_page_patterns)
+        self._exclude_prefixes = literal_prefixes(config.exclude_page_patterns)
     
     def set_snapshot_callback(self, callback: SnapshotCallback):
         """Set callback to be notified when snapshots are taken."""
@@ -55,114 +150,208 @@ class Crawler:
     async def _take_snapshot(self, page: Page, label: str = "") -> str:
         """Take a screenshot of the current page state."""
         page_num = len(self.visited_urls)
-        timestamp = datetime.now().strftime("%H%M%S")
+        taken_at = datetime.now()  # One clock read for both the filename and the index
+        timestamp = taken_at.strftime("%H%M%S")
         safe_label = re.sub(r'[^\w\-]', '_', label)[:30] if label else ""
-        filename = f"page_{page_num:03d}_{timestamp}_{safe_label}.png"
-        filepath = self.snapshots_dir / filename
+        is_png = self.config.snapshot_format == "png"
+        extension = "png" if is_png else "jpg"
+        # page_num is shared between workers, so the sequence number keeps names unique
+        seq = next(self._snapshot_seq)
+        filename = f"page_{page_num:03d}_{seq:04d}_{timestamp}_{safe_label}.{extension}"
+        filepath = self._snapshots_prefix + filename
         
+        url = page.url  # The page may navigate away before the write lands
         try:
-            await page.screenshot(path=str(filepath), full_page=False)
-            
-            snapshot_info = {
-                "path": str(filepath),
-                "filename": filename,
-                "url": page.url,
-                "page_num": page_num,
-                "label": label,
-                "timestamp": datetime.now().isoformat(),
-            }
-            self.snapshots.append(snapshot_info)
-            
-            console.print(f"   [dim magenta]📸 Snapshot: {filename}[/]")
-            
-            # Notify callback if set
-            if self.snapshot_callback:
-                self.snapshot_callback(str(filepath), page.url, page_num)
-            
-            return str(filepath)
+            # JPEG encodes much faster than PNG and snapshots are only for debugging
+            if is_png:
+                image = await page.screenshot(full_page=False, type="png")
+            else:
+                image = await page.screenshot(
+                    full_page=False, type="jpeg", quality=self.config.snapshot_quality
+                )
         except Exception as e:
             console.print(f"   [dim red]⚠ Snapshot failed: {e}[/]")
             return ""
+        
+        # Write in the background so the crawl moves on without waiting for disk;
+        # the snapshot is recorded and announced once the file exists
+        while len(self._snapshot_writes) >= MAX_PENDING_SNAPSHOT_WRITES:
+            await asyncio.wait(set(self._snapshot_writes), return_when=asyncio.FIRST_COMPLETED)
+        write = asyncio.create_task(asyncio.to_thread(_write_file, filepath, image))
+        self._snapshot_writes.add(write)
+        write.add_done_callback(partial(
+            self._snapshot_written,
+            {
+                "path": filepath,
+                "filename": filename,
+                "url": url,
+                "page_num": page_num,
+                "label": label,
+                "timestamp": taken_at.isoformat(),
+            },
+        ))
+        return filepath
+    
+    def _snapshot_written(self, snapshot_info: dict, write: asyncio.Task):
+        """Record a snapshot once its background write has finished."""
+        self._snapshot_writes.discard(write)
+        if write.cancelled():
+            return
+        error = write.exception()
+        if error is not None:
+            console.print(f"   [dim red]⚠ Snapshot failed: {error}[/]")
+            return
+        
+        self.snapshots.append(snapshot_info)
+        self._append_snapshot_index(snapshot_info)
+        
+        console.print(f"   [dim magenta]📸 Snapshot: {snapshot_info['filename']}[/]")
+        
+        # Notify callback if set
+        if self.snapshot_callback:
+            self.snapshot_callback(snapshot_info["path"], snapshot_info["url"], snapshot_info["page_num"])
+    
+    def _append_snapshot_index(self, snapshot_info: dict):
+        """Append a snapshot entry to the NDJSON index as soon as it is taken."""
+        if self._snapshot_index_file is None:
+            self._snapshot_index_file = open(
+                self._snapshots_prefix + "index.ndjson", "wb", buffering=64 * 1024
+            )
+        self._snapshot_index_file.write(json.dumps(snapshot_info).encode() + b"\n")
+    
+    async def _close_snapshot_index(self):
+        """Let outstanding screenshot writes land, then finalize the index."""
+        try:
+            if self._snapshot_writes:
+                await asyncio.gather(*self._snapshot_writes, return_exceptions=True)
+        finally:
+            self._finalize_snapshot_index()
+    
+    def _finalize_snapshot_index(self):
+        """Close the NDJSON index and stream it into the index.json array."""
+        if self._snapshot_index_file is None:
+            return
+        self._snapshot_index_file.close()
+        self._snapshot_index_file = None
+        
+        ndjson_path = self._snapshots_prefix + "index.ndjson"
+        index_path = self._snapshots_prefix + "index.json"
+        fd = os.open(index_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            out = bytearray(b"[")
+            first = True
+            with open(ndjson_path, "rb") as src:
+                for line in src:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    out += b"\n  " if first else b",\n  "
+                    out += line
+                    first = False
+                    # Flush in chunks so memory stays bounded on long crawls
+                    if len(out) >= 64 * 1024:
+                        _write_all(fd, out)
+                        out.clear()
+            out += b"\n]\n"
+            _write_all(fd, out)
+        finally:
+            os.close(fd)
     
     def _is_same_origin(self, url: str) -> bool:
         """Check if URL is from the same origin."""
+        # Fast path: the base origin followed by a path, query, fragment or nothing
+        prefix = self._origin_prefix
+        if url.startswith(prefix):
+            rest = url[len(prefix):len(prefix) + 1]
+            if rest in ("", "/", "?", "#"):
+                return True
+        
         try:
-            parsed = urlparse(url)
+            parsed = _parse_url(url)
             return parsed.netloc == self.base_domain
         except Exception:
             return False
     
     def _normalize_url(self, url: str) -> str:
         """Normalize URL for deduplication."""
-        parsed = urlparse(url)
-        # Remove fragment and normalize
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-        if parsed.query:
-            # Sort query params for consistent deduplication
-            params = sorted(parsed.query.split("&"))
-            normalized += "?" + "&".join(params)
-        return normalized.rstrip("/")
+        return normalize_url(url)
     
     def _should_visit(self, url: str) -> bool:
         """Check if URL should be visited."""
+        # Exact repeats (e.g. menu links) are rejected without any parsing
+        if url in self._raw_visited:
+            return False
+        
+        # Origin/extension/exclude checks never change for a URL, so memoize them
+        crawlable = self._crawlable_cache.get(url)
+        if crawlable is None:
+            crawlable = self._is_crawlable(url)
+            # Every distinct link ever seen lands here, so keep it bounded
+            if len(self._crawlable_cache) >= CRAWLABLE_CACHE_SIZE:
+                self._crawlable_cache.clear()
+            self._crawlable_cache[url] = crawlable
+        if not crawlable:
+            return False
+        
+        # Check if already visited
+        if url_digest(self._normalize_url(url)) in self.visited_urls:
+            return False
+        
+        return True
+    
+    def _is_crawlable(self, url: str) -> bool:
+        """Check the static (crawl-state independent) rules for visiting a URL."""
         # Must be same origin
         if not self._is_same_origin(url):
             return False
         
         # Skip certain file types
-        skip_extensions = {
-            ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico",
-            ".css", ".js", ".woff", ".woff2", ".ttf", ".eot",
-            ".pdf", ".zip", ".tar", ".gz", ".mp4", ".mp3",
-        }
-        
-        parsed = urlparse(url)
+        parsed = _parse_url(url)
         path = parsed.path.lower()
         
-        for ext in skip_extensions:
-            if path.endswith(ext):
-                return False
+        # Only the tail can hold a skipped extension (longest is ".woff2")
+        if "." in path[-8:] and path[path.rfind("."):] in SKIP_EXTENSIONS:
+            return False
         
-        # Check if already visited
-        normalized = self._normalize_url(url)
-        if normalized in self.visited_urls:
+        # Skip pages the user excluded from the crawl
+        if self._exclude_re and (url.startswith(self._exclude_prefixes) or self._exclude_re.match(url)):
             return False
         
         return True
     
     async def _extract_links(self, page: Page) -> list[str]:
         """Extract all links from the page."""
-        links = []
+        links: dict[str, None] = {}  # Ordered set - nav links repeat on every page
         
         try:
-            # Get href attributes from anchor tags
-            anchors = await page.query_selector_all("a[href]")
-            for anchor in anchors:
-                try:
-                    href = await anchor.get_attribute("href")
-                    if href:
-                        # Convert relative URLs to absolute
-                        absolute_url = urljoin(page.url, href)
-                        links.append(absolute_url)
-                except Exception:
-                    pass
+            # Collect hrefs and route-like data attributes in a single round-trip.
+            # The browser resolves them to absolute URLs (honouring <base href>).
+            absolute_links = await page.evaluate("""
+                () => {
+                    const out = [];
+                    document.querySelectorAll('a[href]').forEach(a => {
+                        if (a.getAttribute('href')) out.push(a.href);
+                    });
+                    document.querySelectorAll('[data-href], [data-link], [data-route]').forEach(el => {
+                        for (const attr of ['data-href', 'data-link', 'data-route']) {
+                            const value = el.getAttribute(attr);
+                            if (!value) continue;
+                            try {
+                                out.push(new URL(value, document.baseURI).href);
+                            } catch (e) {}
+                        }
+                    });
+                    return out;
+                }
+            """)
             
-            # Also check for data attributes that might contain links
-            elements_with_routes = await page.query_selector_all("[data-href], [data-link], [data-route]")
-            for elem in elements_with_routes:
-                for attr in ["data-href", "data-link", "data-route"]:
-                    try:
-                        value = await elem.get_attribute(attr)
-                        if value:
-                            absolute_url = urljoin(page.url, value)
-                            links.append(absolute_url)
-                    except Exception:
-                        pass
+            for url in absolute_links:
+                links[url] = None
                         
         except Exception as e:
             self.errors.append(f"Error extracting links: {str(e)}")
         
-        return links
+        return list(links)
     
     async def _interact_with_page(self, page: Page):
         """Interact with page elements to trigger API calls."""
@@ -193,18 +382,28 @@ class Crawler:
                 # Click first item, then check if 2nd item gives same API
                 items_to_click = elements[:2]  # First 2 items
                 
-                for i, elem in enumerate(items_to_click):
+                # Query visibility, size and text for all candidates concurrently
+                infos = await asyncio.gather(
+                    *[
+                        asyncio.gather(elem.is_visible(), elem.bounding_box(), elem.inner_text())
+                        for elem in items_to_click
+                    ],
+                    return_exceptions=True,
+                )
+                
+                for i, (elem, info) in enumerate(zip(items_to_click, infos)):
                     try:
-                        is_visible = await elem.is_visible()
+                        if isinstance(info, BaseException):
+                            continue
+                        
+                        is_visible, box, elem_text = info
                         if not is_visible:
                             continue
                         
-                        box = await elem.bounding_box()
                         if not box or box["width"] <= 0 or box["height"] <= 0:
                             continue
                         
                         # Get some identifier for this element
-                        elem_text = await elem.inner_text()
                         elem_id = elem_text[:50] if elem_text else f"elem_{i}"
                         
                         if elem_id in clicked_items:
@@ -226,7 +425,7 @@ class Crawler:
                             await self._take_snapshot(page, f"after_click_{elem_id[:20]}")
                         
                         # Go back if we navigated away
-                        if page.url != self.current_page_url:
+                        if page.url != self._page_urls.get(page, self.current_page_url):
                             await page.go_back(timeout=5000)
                             await asyncio.sleep(0.5)
                         
@@ -248,21 +447,47 @@ class Crawler:
             '[class*="edit"]', '[class*="show"]',
         ]
         
-        for selector in interactive_selectors:
+        try:
+            # Find and visibility-check the first 2 matches of every selector
+            # in one round-trip, then click them for real: Playwright clicks
+            # scroll into view, wait for actionability and send trusted events
+            candidates = await page.evaluate_handle("""
+                (selectors) => {
+                    const seen = new Set();
+                    const visible = [];
+                    for (const sel of selectors) {
+                        let matches = [];
+                        try { matches = Array.from(document.querySelectorAll(sel)).slice(0, 2); } catch (e) {}
+                        for (const el of matches) {
+                            if (seen.has(el)) continue;
+                            seen.add(el);
+                            const rect = el.getBoundingClientRect();
+                            if (rect.width <= 0 || rect.height <= 0) continue;
+                            if (el.checkVisibility && !el.checkVisibility({ visibilityProperty: true })) continue;
+                            visible.push(el);
+                        }
+                    }
+                    return visible;
+                }
+            """, interactive_selectors)
             try:
-                elements = await page.query_selector_all(selector)
-                for elem in elements[:2]:  # Limit to first 2
-                    try:
-                        is_visible = await elem.is_visible()
-                        if is_visible:
-                            box = await elem.bounding_box()
-                            if box and box["width"] > 0 and box["height"] > 0:
-                                await elem.click(timeout=2000)
-                                await asyncio.sleep(0.5)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+                properties = await candidates.get_properties()
+            finally:
+                await candidates.dispose()
+            
+            elements = [prop.as_element() for prop in properties.values()]
+            for elem in elements:
+                if elem is None:
+                    continue
+                try:
+                    # Earlier clicks may have re-rendered the element away;
+                    # a detached handle fails fast instead of waiting
+                    await elem.click(timeout=2000)
+                    await asyncio.sleep(0.5)  # Let this click's requests start before the next
+                except Exception:
+                    pass
+        except Exception:
+            pass
         
         # 3. Scroll to trigger LAZY LOADING
         try:
@@ -290,12 +515,22 @@ class Crawler:
     async def _crawl_page(self, page: Page, url: str, depth: int) -> list[str]:
         """Crawl a single page and return discovered links."""
         normalized = self._normalize_url(url)
-        if normalized in self.visited_urls:
+        key = url_digest(normalized)
+        if key in self.visited_urls:
+            return []
+        
+        if len(self.visited_urls) >= self.config.max_pages:
             return []
         
-        self.visited_urls.add(normalized)
+        self.visited_urls.add(key)
+        self.pages_visited.append(normalized)
+        segment = self._path_segment(url)
+        self._segment_counts[segment] = self._segment_counts.get(segment, 0) + 1
+        self._raw_visited.add(url)
         self.current_page_url = url
+        self._page_urls[page] = url
         
+        self.interceptor.flush_logs()  # Keep the previous page's API log above this header
         console.print(f"\n[bold blue]📄 Page {len(self.visited_urls)}:[/] {url}")
         console.print(f"   [dim]Depth: {depth}/{self.config.max_depth}[/]")
         
@@ -306,13 +541,13 @@ class Crawler:
             if response and response.status >= 400:
                 console.print(f"   [yellow]⚠ Status: {response.status}[/]")
             
-            # Wait for initial content and API calls
-            await asyncio.sleep(self.config.wait_time / 1000)
-            
+            # Wait for initial content and API calls: move on as soon as the
+            # network goes idle, but never wait longer than wait_time, so pages
+            # that poll forever cost exactly the configured wait
             try:
-                await page.wait_for_load_state("networkidle", timeout=10000)
+                await page.wait_for_load_state("networkidle", timeout=self.config.wait_time)
             except Exception:
-                pass  # May timeout, that's ok
+                pass  # Still busy after wait_time, that's ok
             
             # Take snapshot of the page
             await self._take_snapshot(page, "initial")
@@ -320,6 +555,9 @@ class Crawler:
             # Interact with page to trigger more API calls
             await self._interact_with_page(page)
             
+            # Start fetching the next queued page while this one settles
+            await self._prefetch_next(page)
+            
             # Take snapshot after interactions
             await self._take_snapshot(page, "after_interactions")
             
@@ -348,6 +586,93 @@ class Crawler:
                 pass
             return []
     
+    def _enqueue(self, url: str, depth: int):
+        """Add a URL to the crawl frontier, unless it was already queued."""
+        # Different pages link to the same URL (or the same page under another
+        # fragment/query order); queue each normalized URL only once so
+        # duplicates don't eat into the max_pages budget check
+        key = url_digest(self._normalize_url(url))
+        if key in self._queued_keys:
+            return
+        self._queued_keys.add(key)
+        
+        # Shallow pages first, pushed back by how many pages under the same
+        # first path segment were already crawled, so the page budget goes to
+        # structurally new sections (and their APIs) before more of the same
+        priority = depth + self._segment_counts.get(self._path_segment(url), 0)
+        heapq.heappush(self._frontier, (priority, self._frontier_seq, url, depth))
+        self._frontier_seq += 1
+    
+    def _path_segment(self, url: str) -> str:
+        """First path segment of a URL ("" for the site root)."""
+        return _parse_url(url).path.lstrip("/").partition("/")[0]
+    
+    async def _prefetch_next(self, page: Page):
+        """Hint the browser to prefetch the next queued URL into its HTTP cache."""
+        # Routing disables Playwright's HTTP cache, so with resource blocking on
+        # a prefetch would only fetch the page twice; with several workers the
+        # head of the frontier is usually taken by another page anyway
+        if self.config.blocked_resource_types or self.config.concurrency > 1:
+            return
+        if not self._frontier:
+            return
+        next_url = self._frontier[0][2]
+        if not self._should_visit(next_url):
+            return
+        
+        try:
+            await page.evaluate("""
+                (url) => {
+                    const link = document.createElement('link');
+                    link.rel = 'prefetch';
+                    link.href = url;
+                    (document.head || document.documentElement).appendChild(link);
+                }
+            """, next_url)
+        except Exception:
+            pass
+    
+    def _dequeue(self) -> tuple[str, int]:
+        """Pop the highest-priority URL from the crawl frontier."""
+        _, _, url, depth = heapq.heappop(self._frontier)
+        return url, depth
+    
+    def _queue_size(self) -> int:
+        """Number of URLs waiting in the crawl frontier."""
+        return len(self._frontier)
+    
+    def _source_page_getter(self, page: Page) -> Callable[[], str]:
+        """Return a callable giving the URL the given page is crawling."""
+        return lambda: self._page_urls.get(page, self.current_page_url)
+    
+    async def _crawl_worker(self, page: Page):
+        """Consume URLs from the shared frontier until it is exhausted."""
+        while len(self.visited_urls) < self.config.max_pages:
+            if not self._queue_size():
+                # Other workers may still discover links; wait for them
+                if self._active_workers == 0:
+                    break
+                self._frontier_changed.clear()
+                await self._frontier_changed.wait()
+                continue
+            
+            url, depth = self._dequeue()
+            
+            if not self._should_visit(url):
+                continue
+            
+            self._active_workers += 1
+            try:
+                new_links = await self._crawl_page(page, url, depth)
+                
+                # Add new links to queue
+                for link in new_links:
+                    if len(self.visited_urls) + self._queue_size() < self.config.max_pages:
+                        self._enqueue(link, depth + 1)
+            finally:
+                self._active_workers -= 1
+                self._frontier_changed.set()
+    
     async def crawl(self) -> CrawlResult:
         """Execute the crawl and return results."""
         result = CrawlResult(config=self.config)
@@ -360,52 +685,85 @@ class Crawler:
         console.print(f"[bold]Max Pages:[/] {self.config.max_pages}")
         console.print(f"[bold]Max Depth:[/] {self.config.max_depth}")
         
-        async with async_playwright() as p:
-            # Launch browser
-            console.print("\n[cyan]🚀 Launching browser...[/]")
-            browser = await p.chromium.launch(headless=self.config.headless)
-            
-            # Create context with viewport
-            context = await browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            )
-            
-            page = await context.new_page()
-            
-            # Set up interceptor
-            await self.interceptor.setup(page, lambda: self.current_page_url)
-            
-            # Handle authentication
-            console.print("\n[cyan]🔐 Setting up authentication...[/]")
-            auth_success = await self.auth_handler.setup_auth(context, page)
-            
-            if not auth_success:
-                console.print("[yellow]⚠ Authentication may have failed, continuing anyway...[/]")
-            
-            # Start crawling
-            console.print("\n[cyan]🕷️ Starting crawl...[/]")
-            
-            self.urls_to_visit.append((self.config.start_url, 0))
-            
-            while self.urls_to_visit and len(self.visited_urls) < self.config.max_pages:
-                url, depth = self.urls_to_visit.popleft()
+        try:
+            async with async_playwright() as p:
+                # Launch browser
+                console.print("\n[cyan]🚀 Launching browser...[/]")
+                browser = await p.chromium.launch(headless=self.config.headless)
                 
-                if not self._should_visit(url):
-                    continue
+                # Restore cookies/local storage from a previous run if available
+                session_file = self.config.session_file
+                restored_session = bool(session_file and os.path.exists(session_file))
                 
-                new_links = await self._crawl_page(page, url, depth)
+                # Create context with viewport
+                context = await browser.new_context(
+                    viewport={"width": 1920, "height": 1080},
+                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                    storage_state=session_file if restored_session else None,
+                )
                 
-                # Add new links to queue
-                for link in new_links:
-                    if len(self.visited_urls) + len(self.urls_to_visit) < self.config.max_pages:
-                        self.urls_to_visit.append((link, depth + 1))
-            
-            # Close browser
-            await browser.close()
+                # One blocking route on the context covers the page, every worker
+                # page and any popups, instead of a route per page
+                await self.interceptor.setup_context(context)
+                
+                page = await context.new_page()
+                
+                # Set up interceptor
+                await self.interceptor.setup(page, self._source_page_getter(page))
+                
+                # Handle authentication
+                console.print("\n[cyan]🔐 Setting up authentication...[/]")
+                auth_success = await self.auth_handler.setup_auth(context, page, restored_session)
+                
+                if not auth_success:
+                    console.print("[yellow]⚠ Authentication may have failed, continuing anyway...[/]")
+                elif session_file:
+                    # Save the authenticated session so the next run can skip login
+                    try:
+                        await context.storage_state(path=session_file)
+                    except Exception as e:
+                        self.errors.append(f"Error saving session: {str(e)}")
+                
+                # Start crawling
+                console.print("\n[cyan]🕷️ Starting crawl...[/]")
+                
+                self._enqueue(self.config.start_url, 0)
+                
+                # Extra pages share the authenticated context's cookies
+                pages = [page]
+                concurrency = min(max(1, self.config.concurrency), MAX_CONCURRENCY)
+                if concurrency < self.config.concurrency:
+                    console.print(f"[yellow]⚠ Concurrency capped at {MAX_CONCURRENCY} pages[/]")
+                for _ in range(concurrency - 1):
+                    worker_page = await context.new_page()
+                    await self.interceptor.setup(worker_page, self._source_page_getter(worker_page))
+                    pages.append(worker_page)
+                
+                if len(pages) > 1:
+                    console.print(f"[dim]Crawling with {len(pages)} concurrent pages[/]")
+                
+                # A failing worker mustn't propagate while the others still use
+                # pages this block is about to close; the rest drain the frontier
+                outcomes = await asyncio.gather(
+                    *(self._crawl_worker(worker_page) for worker_page in pages),
+                    return_exceptions=True,
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, Exception):
+                        error_msg = f"Crawl worker failed: {outcome!r}"
+                        console.print(f"[red]✗ {error_msg}[/]")
+                        self.errors.append(error_msg)
+                self.interceptor.flush_logs()
+                
+                # Close browser
+                await browser.close()
+        finally:
+            # Runs on cancellation and errors too, so the index is never lost
+            # and the NDJSON handle never leaks
+            await self._close_snapshot_index()
         
         # Compile results
-        result.pages_visited = list(self.visited_urls)
+        result.pages_visited = list(self.pages_visited)
         result.errors = self.errors
         result.end_time = datetime.now()
         
@@ -418,12 +776,7 @@ class Crawler:
         console.print(f"  [dim]Snapshots taken: {len(self.snapshots)}[/]")
         console.print(f"  [dim]Duration: {result.duration_seconds:.1f}s[/]")
         
-        # Save snapshot index
         if self.snapshots:
-            import json
-            index_path = self.snapshots_dir / "index.json"
-            with open(index_path, "w") as f:
-                json.dump(self.snapshots, f, indent=2)
             console.print(f"  [dim]Snapshots saved to: {self.snapshots_dir}[/]")
         
         return result, captured
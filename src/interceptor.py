@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import re
 import json
+import asyncio
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Optional, Any
-from urllib.parse import urlparse, parse_qs, unquote
+from urllib.parse import urlsplit, parse_qs, unquote
 
-from playwright.async_api import Page, Request, Response, Route
+from playwright.async_api import BrowserContext, Page, Request, Response, Route
 from rich.console import Console
 
 from .models import (
@@ -18,10 +20,150 @@ from .models import (
     CapturedResponse,
     CrawlConfig,
     HttpMethod,
+    split_url,
 )
 
 console = Console()
 
+# Resource types that are never API calls
+NON_API_RESOURCE_TYPES = frozenset({"document", "stylesheet", "image", "font", "media", "manifest"})
+
+# Common API path indicators, as one case-insensitive pattern
+API_PATH_RE = re.compile(r"/(?:api/|v[123]/|graphql|rest/|data/|ajax/|json/)", re.I)
+
+# Classifies a whole path segment as a likely parameter in one match; the
+# matching group name is the parameter type
+PATH_PARAM_RE = re.compile(
+    r"(?:(?P<integer>\d+)"
+    r"|(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+    r"|(?P<objectid>[0-9a-f]{24})"
+    r"|(?P<slug>[a-z0-9]+(?:-[a-z0-9]+)+))\Z",
+    re.I,
+)
+
+PATH_PARAM_DESCRIPTIONS = {
+    "integer": "Numeric ID",
+    "uuid": "UUID identifier",
+    "objectid": "Object ID",
+    "slug": "URL slug",
+}
+
+# Query values that look like ISO dates (YYYY-MM-DD...)
+DATE_VALUE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# A body whose first non-whitespace character opens a JSON object or array
+JSON_START_RE = re.compile(r'\s*[\[{]')
+
+# ID-like path segments replaced by placeholders in API signatures
+SIGNATURE_ID_RE = re.compile(
+    r"/(?:(?P<id>\d+)"
+    r"|(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+    r"|(?P<objectid>[0-9a-f]{24}))(?=/|$)",
+    re.I,
+)
+
+# HttpMethod members by value, so lookups don't go through the enum constructor.
+# Browsers only upper-case the standard methods; fetch() sends e.g. "patch"
+# as written, so lower-case spellings are mapped too.
+HTTP_METHODS = {m.value: m for m in HttpMethod}
+HTTP_METHODS.update({m.value.lower(): m for m in HttpMethod})
+
+# Number of _should_capture verdicts remembered (oldest evicted first)
+CAPTURE_CACHE_SIZE = 8192
+
+# Pending requests older than this (seconds) are assumed to never get a response
+PENDING_REQUEST_TTL = 60
+
+# Only sweep stale pending requests once this many are outstanding, and at
+# most once per PENDING_PRUNE_INTERVAL seconds
+PENDING_PRUNE_THRESHOLD = 256
+PENDING_PRUNE_INTERVAL = 10
+
+# Hard cap on pending requests; the oldest is dropped to make room
+PENDING_REQUEST_LIMIT = 4096
+
+# Response bodies larger than this are decoded in a worker thread
+THREADED_DECODE_BYTES = 256 * 1024
+
+# How long request/response log lines are buffered before being printed together
+LOG_FLUSH_INTERVAL = 0.2
+
+
+# Type names of the values json.loads produces
+JSON_TYPE_NAMES = {str: "str", int: "int", float: "float", bool: "bool", type(None): "NoneType", list: "list", dict: "dict"}
+
+
+def _type_name(value: Any) -> str:
+    """type(value).__name__, with a table lookup for JSON value types."""
+    return JSON_TYPE_NAMES.get(type(value)) or type(value).__name__
+
+
+def query_keys(query: str) -> list[str]:
+    """Sorted parameter names of a query string, as parse_qs(query).keys() would give."""
+    keys = set()
+    for pair in query.split("&"):
+        name, _, value = pair.partition("=")
+        # parse_qs drops parameters with blank values
+        if value:
+            if "%" in name or "+" in name:
+                name = unquote(name.replace("+", " "))
+            keys.add(name)
+    return sorted(keys)
+
+
+def api_signature(method: str, url: str) -> str:
+    """Signature identifying an API pattern: method, host, ID-normalized path and query keys."""
+    parsed = split_url(url)
+    
+    # Normalize path - replace IDs with placeholders
+    path = SIGNATURE_ID_RE.sub(lambda m: f"/{{{m.lastgroup}}}", parsed.path)
+    
+    # Include query param keys (not values) in signature
+    keys = query_keys(parsed.query)
+    
+    return f"{method}:{parsed.netloc}{path}:{','.join(keys)}"
+
+
+@lru_cache(maxsize=4096)
+def api_fingerprint(method: str, url: str) -> int:
+    """64-bit BLAKE2 digest of api_signature(), memoized per exact (method, URL)."""
+    digest = hashlib.blake2b(api_signature(method, url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def compile_pattern_union(patterns: list[str]) -> Optional[re.Pattern]:
+    """Combine regex patterns into a single alternation (None if there are none)."""
+    if not patterns:
+        return None
+    return _compile_union(tuple(patterns))
+
+
+# A pattern that is just a literal URL prefix, optionally anchored with ^ and/or
+# followed by .* (a "." in it is a wildcard, but matching it literally is
+# still a regex match)
+LITERAL_PREFIX_RE = re.compile(r"\^?([A-Za-z0-9:/_-][A-Za-z0-9:/._-]*?)(?:\.\*)?")
+
+
+def literal_prefixes(patterns: list[str]) -> tuple[str, ...]:
+    """URL prefixes that satisfy a literal-prefix pattern; url.startswith() on
+    these implies the pattern matches, so they can be checked before the regex."""
+    prefixes = []
+    for pattern in patterns:
+        match = LITERAL_PREFIX_RE.fullmatch(pattern)
+        if match:
+            prefixes.append(match.group(1))
+    return tuple(prefixes)
+
+
+@lru_cache(maxsize=32)
+def _compile_union(patterns: tuple[str, ...]) -> re.Pattern:
+    """Compile a pattern alternation once per distinct pattern list.
+    
+    The crawler and interceptor compile the same config's patterns, and
+    most configs use the default exclude list, so this is shared.
+    """
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
 
 class APIInterceptor:
     """Intercepts and captures API calls from browser network traffic."""
@@ -29,13 +171,49 @@ class APIInterceptor:
     def __init__(self, config: CrawlConfig):
         self.config = config
         self.captured_endpoints: list[CapturedEndpoint] = []
-        self._pending_requests: dict[str, tuple[CapturedRequest, str]] = {}
-        self._exclude_patterns = [re.compile(p) for p in config.exclude_patterns]
-        self._include_patterns = [re.compile(p) for p in config.include_patterns] if config.include_patterns else None
+        self._pending_requests: dict[Request, tuple[HttpMethod, datetime, str]] = {}
+        self._exclude_re = compile_pattern_union(config.exclude_patterns)
+        self._include_re = compile_pattern_union(config.include_patterns)
+        self._exclude_prefixes = literal_prefixes(config.exclude_patterns)
+        self._include_prefixes = literal_prefixes(config.include_patterns)
+        self._capture_cache: dict[tuple[str, str], bool] = {}  # (url, resource_type) -> verdict
+        self._last_prune: datetime = datetime.min
         
         # For deduplication - track unique API patterns
-        self._seen_api_patterns: set[str] = set()
+        self._seen_api_patterns: set[int] = set()  # api_fingerprint() of each pattern
         self._duplicate_count: int = 0
+        
+        # Per-request log lines, rendered in one console.print per flush
+        self._log_batch: list[str] = []
+        self._reported_duplicates: int = 0  # Duplicates already summarized in the log
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def _log(self, message: Optional[str] = None):
+        """Queue a log line (if given) and schedule a flush if one isn't pending."""
+        if message is not None:
+            self._log_batch.append(message)
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_logs_later())
+    
+    async def _flush_logs_later(self):
+        """Print the queued log lines after a short delay."""
+        try:
+            await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        finally:
+            self._flush_task = None
+        self.flush_logs()
+    
+    def flush_logs(self):
+        """Print any queued log lines now."""
+        # Polling pages repeat the same calls constantly, so duplicates get
+        # one summary line per flush rather than a line each
+        skipped = self._duplicate_count - self._reported_duplicates
+        if skipped:
+            self._reported_duplicates = self._duplicate_count
+            self._log_batch.append(f"  [dim yellow]↺ Skipped {skipped} duplicate API pattern(s)[/]")
+        if self._log_batch:
+            console.print("\n".join(self._log_batch))
+            self._log_batch.clear()
     
     def _extract_path_params(self, path: str) -> dict[str, str]:
         """Extract potential path parameters (IDs, UUIDs, etc.)"""
@@ -46,25 +224,21 @@ class APIInterceptor:
             if not part:
                 continue
             
-            # Detect numeric IDs
-            if part.isdigit():
-                params[f"path_param_{i}"] = {"value": part, "type": "integer", "description": "Numeric ID"}
-            # Detect UUIDs
-            elif re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', part, re.I):
-                params[f"path_param_{i}"] = {"value": part, "type": "uuid", "description": "UUID identifier"}
-            # Detect hex IDs (like MongoDB ObjectIds)
-            elif re.match(r'^[0-9a-f]{24}$', part, re.I):
-                params[f"path_param_{i}"] = {"value": part, "type": "objectid", "description": "Object ID"}
-            # Detect slugs (words with dashes)
-            elif re.match(r'^[a-z0-9]+(?:-[a-z0-9]+)+$', part, re.I):
-                params[f"path_param_{i}"] = {"value": part, "type": "slug", "description": "URL slug"}
+            # Numeric IDs, UUIDs, hex IDs (like MongoDB ObjectIds) and slugs
+            match = PATH_PARAM_RE.match(part)
+            if match:
+                param_type = match.lastgroup
+                params[f"path_param_{i}"] = {
+                    "value": part,
+                    "type": param_type,
+                    "description": PATH_PARAM_DESCRIPTIONS[param_type],
+                }
         
         return params
     
     def _extract_query_params(self, url: str) -> dict[str, Any]:
         """Extract and analyze query parameters."""
-        parsed = urlparse(url)
-        query_params = parse_qs(parsed.query)
+        query_params = parse_qs(urlsplit(url).query)
         
         analyzed_params = {}
         for key, values in query_params.items():
@@ -77,7 +251,7 @@ class APIInterceptor:
                     param_info["type"] = "integer"
                 elif value.lower() in ('true', 'false'):
                     param_info["type"] = "boolean"
-                elif re.match(r'^\d{4}-\d{2}-\d{2}', value):
+                elif DATE_VALUE_RE.match(value):
                     param_info["type"] = "date"
                 else:
                     param_info["type"] = "string"
@@ -94,7 +268,7 @@ class APIInterceptor:
             return {}
         
         # Try JSON
-        if "json" in content_type.lower() or body.strip().startswith(('{', '[')):
+        if "json" in content_type.lower() or JSON_START_RE.match(body):
             try:
                 data = json.loads(body)
                 return self._analyze_json_structure(data)
@@ -109,199 +283,237 @@ class APIInterceptor:
             except:
                 pass
         
-        return {"raw_body": {"value": body[:500], "type": "raw"}}
+        return {"raw_body": {"value": body[:500] if len(body) > 500 else body, "type": "raw"}}
     
     def _analyze_json_structure(self, data: Any, prefix: str = "") -> dict[str, Any]:
-        """Recursively analyze JSON structure to extract parameter info."""
+        """Walk a JSON structure depth-first to extract parameter info."""
         result = {}
         
         if isinstance(data, dict):
-            for key, value in data.items():
-                full_key = f"{prefix}.{key}" if prefix else key
-                
-                if isinstance(value, dict):
-                    result.update(self._analyze_json_structure(value, full_key))
-                elif isinstance(value, list):
-                    result[full_key] = {
-                        "type": "array",
-                        "value": value[:3] if len(value) > 3 else value,  # Sample
-                        "item_type": type(value[0]).__name__ if value else "unknown"
-                    }
+            # Explicit stack of (items iterator, key prefix) instead of recursion;
+            # flattened keys come out in the same order as a recursive walk
+            stack = [(iter(data.items()), prefix)]
+            while stack:
+                items, item_prefix = stack[-1]
+                for key, value in items:
+                    full_key = f"{item_prefix}.{key}" if item_prefix else key
+                    
+                    if isinstance(value, dict):
+                        stack.append((iter(value.items()), full_key))
+                        break
+                    elif isinstance(value, list):
+                        result[full_key] = {
+                            "type": "array",
+                            "value": value[:3] if len(value) > 3 else value,  # Sample
+                            "item_type": _type_name(value[0]) if value else "unknown"
+                        }
+                    else:
+                        result[full_key] = {
+                            "type": _type_name(value),
+                            "value": value
+                        }
                 else:
-                    result[full_key] = {
-                        "type": type(value).__name__,
-                        "value": value
-                    }
+                    stack.pop()
         elif isinstance(data, list):
             result["items"] = {
                 "type": "array",
                 "value": data[:3] if len(data) > 3 else data,
-                "item_type": type(data[0]).__name__ if data else "unknown"
+                "item_type": _type_name(data[0]) if data else "unknown"
             }
         
         return result
     
     def _get_api_signature(self, method: str, url: str, body: str = "") -> str:
         """Generate a signature to identify duplicate API patterns."""
-        parsed = urlparse(url)
-        
-        # Normalize path - replace IDs with placeholders
-        path = parsed.path
-        path = re.sub(r'/\d+(?=/|$)', '/{id}', path)  # numeric IDs
-        path = re.sub(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)', '/{uuid}', path, flags=re.I)
-        path = re.sub(r'/[0-9a-f]{24}(?=/|$)', '/{objectid}', path, flags=re.I)
-        
-        # Include query param keys (not values) in signature
-        query_keys = sorted(parse_qs(parsed.query).keys())
-        
-        signature = f"{method}:{parsed.netloc}{path}:{','.join(query_keys)}"
-        return signature
+        return api_signature(method, url)
     
     def _is_duplicate_api(self, method: str, url: str, body: str = "") -> bool:
         """Check if we've already captured this API pattern."""
-        signature = self._get_api_signature(method, url, body)
+        # Pages poll the same exact URLs repeatedly, so fingerprints are memoized
+        fingerprint = api_fingerprint(method, url)
         
-        if signature in self._seen_api_patterns:
+        if fingerprint in self._seen_api_patterns:
             self._duplicate_count += 1
             return True
         
-        self._seen_api_patterns.add(signature)
+        self._seen_api_patterns.add(fingerprint)
         return False
         
     def _should_capture(self, url: str, resource_type: str) -> bool:
         """Determine if this request should be captured as an API call."""
         # Skip non-API resource types
-        if resource_type in ("document", "stylesheet", "image", "font", "media", "manifest"):
+        if resource_type in NON_API_RESOURCE_TYPES:
             return False
         
+        # Polling endpoints and trackers repeat the same URLs all crawl long
+        key = (url, resource_type)
+        verdict = self._capture_cache.get(key)
+        if verdict is None:
+            verdict = self._match_capture_rules(url, resource_type)
+            if len(self._capture_cache) >= CAPTURE_CACHE_SIZE:
+                del self._capture_cache[next(iter(self._capture_cache))]
+            self._capture_cache[key] = verdict
+        return verdict
+    
+    def _match_capture_rules(self, url: str, resource_type: str) -> bool:
+        """Apply the include/exclude patterns and API heuristics to a URL."""
         # Check exclusion patterns
-        for pattern in self._exclude_patterns:
-            if pattern.match(url):
-                return False
+        if self._exclude_re and (url.startswith(self._exclude_prefixes) or self._exclude_re.match(url)):
+            return False
         
         # If include patterns specified, URL must match at least one
-        if self._include_patterns:
-            return any(pattern.match(url) for pattern in self._include_patterns)
-        
-        # Heuristics for API detection
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        
-        # Common API path indicators
-        api_indicators = [
-            "/api/", "/v1/", "/v2/", "/v3/", "/graphql",
-            "/rest/", "/data/", "/ajax/", "/json/",
-        ]
-        
-        if any(indicator in path for indicator in api_indicators):
-            return True
+        if self._include_re:
+            return url.startswith(self._include_prefixes) or self._include_re.match(url) is not None
         
         # XHR/Fetch requests to same origin with JSON are likely API calls
         if resource_type in ("xhr", "fetch"):
             return True
         
-        return False
+        # Heuristics for API detection on other resource types
+        return API_PATH_RE.search(urlsplit(url).path) is not None
+    
+    def _capture_request(self, request: Request, method: HttpMethod, timestamp: datetime) -> Optional[CapturedRequest]:
+        """Build a CapturedRequest, or return None for duplicate API patterns."""
+        url = request.url
+        
+        # Get request body if present
+        body = None
+        try:
+            post_data = request.post_data
+            if post_data:
+                body = post_data
+        except Exception:
+            pass
+        
+        # Check for duplicate API pattern
+        if self._is_duplicate_api(method.value, url, body or ""):
+            self._log()  # Reported as a count when the log is flushed
+            return None
+        
+        # Capture headers (filter out sensitive ones for logging). Playwright
+        # builds a new dict on every .headers access, so no copy is needed.
+        headers = request.headers
+        
+        # Extract parameters
+        content_type = headers.get("content-type", "")
+        parsed_url = split_url(url)
+        
+        path_params = self._extract_path_params(parsed_url.path)
+        query_params = self._extract_query_params(url)
+        body_params = self._extract_body_params(body, content_type) if body else {}
+        
+        # Every field is already the right type, so skip pydantic validation
+        captured_request = CapturedRequest.model_construct(
+            url=url,
+            method=method,
+            headers=headers,
+            body=body,
+            timestamp=timestamp,
+            path_params=path_params,
+            query_params=query_params,
+            body_params=body_params,
+        )
+        
+        self._log(f"  [dim cyan]→ {method.value}[/] [dim]{self._truncate_url(url)}[/]")
+        if query_params:
+            self._log(f"    [dim]Query: {list(query_params.keys())}[/]")
+        if body_params:
+            self._log(f"    [dim]Body: {list(body_params.keys())[:5]}...[/]")
+        
+        return captured_request
+    
+    def _prune_pending(self, now: datetime):
+        """Drop pending requests that have waited longer than PENDING_REQUEST_TTL."""
+        stale = [
+            request for request, (_, request_time, _) in self._pending_requests.items()
+            if (now - request_time).total_seconds() > PENDING_REQUEST_TTL
+        ]
+        for request in stale:
+            del self._pending_requests[request]
+    
+    async def setup_context(self, context: BrowserContext):
+        """Set up context-wide request blocking, shared by every page in it."""
+        blocked_types = frozenset(self.config.blocked_resource_types)
+        if not blocked_types:
+            return
+        
+        async def block_resources(route: Route):
+            """Abort heavy non-API resources so pages load faster."""
+            if route.request.resource_type in blocked_types:
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        await context.route("**/*", block_resources)
     
     async def setup(self, page: Page, current_page_url: Callable[[], str]):
         """Set up request/response interception on the page."""
         
         async def handle_request(request: Request):
-            """Capture outgoing requests."""
-            url = request.url
-            resource_type = request.resource_type
-            
-            if not self._should_capture(url, resource_type):
+            """Note outgoing API requests; details are read once a response arrives."""
+            if not self._should_capture(request.url, request.resource_type):
                 return
             
-            try:
-                method = HttpMethod(request.method.upper())
-            except ValueError:
+            # Only mixed-case spellings need normalizing
+            method = HTTP_METHODS.get(request.method) or HTTP_METHODS.get(request.method.upper())
+            if method is None:
                 return  # Skip unknown methods
             
-            # Get request body if present
-            body = None
-            try:
-                post_data = request.post_data
-                if post_data:
-                    body = post_data
-            except Exception:
-                pass
-            
-            # Check for duplicate API pattern
-            if self._is_duplicate_api(method.value, url, body or ""):
-                console.print(f"  [dim yellow]↺ Duplicate API pattern, skipping[/]")
-                return
-            
-            # Capture headers (filter out sensitive ones for logging)
-            headers = dict(request.headers)
-            
-            # Extract parameters
-            content_type = headers.get("content-type", "")
-            parsed_url = urlparse(url)
-            
-            path_params = self._extract_path_params(parsed_url.path)
-            query_params = self._extract_query_params(url)
-            body_params = self._extract_body_params(body, content_type) if body else {}
-            
-            captured_request = CapturedRequest(
-                url=url,
-                method=method,
-                headers=headers,
-                body=body,
-                timestamp=datetime.now(),
-                path_params=path_params,
-                query_params=query_params,
-                body_params=body_params,
-            )
-            
             # Store pending request with source page
-            request_id = f"{request.method}:{url}:{id(request)}"
-            self._pending_requests[request_id] = (captured_request, current_page_url())
-            
-            console.print(f"  [dim cyan]→ {method.value}[/] [dim]{self._truncate_url(url)}[/]")
-            if query_params:
-                console.print(f"    [dim]Query: {list(query_params.keys())}[/]")
-            if body_params:
-                console.print(f"    [dim]Body: {list(body_params.keys())[:5]}...[/]")
+            now = datetime.now()
+            pending_count = len(self._pending_requests)
+            if pending_count >= PENDING_PRUNE_THRESHOLD and (now - self._last_prune).total_seconds() > PENDING_PRUNE_INTERVAL:
+                self._last_prune = now
+                self._prune_pending(now)
+            # The prune only drops expired entries, so the cap still applies after it
+            if len(self._pending_requests) >= PENDING_REQUEST_LIMIT:
+                # Insertion order is request order, so the first key is the oldest
+                del self._pending_requests[next(iter(self._pending_requests))]
+            self._pending_requests[request] = (method, now, current_page_url())
+        
+        def handle_request_failed(request: Request):
+            """Forget requests that were aborted or failed, they never get a response."""
+            self._pending_requests.pop(request, None)
         
         async def handle_response(response: Response):
             """Capture incoming responses and match with requests."""
+            # Only requests that passed _should_capture were stored, keyed by
+            # the (identity-hashed) Request object itself
             request = response.request
-            url = request.url
-            resource_type = request.resource_type
-            
-            if not self._should_capture(url, resource_type):
+            pending = self._pending_requests.pop(request, None)
+            if pending is None:
                 return
+            response_time = datetime.now()  # When the response arrived, not when its body finished
             
-            request_id = f"{request.method}:{url}:{id(request)}"
-            
-            if request_id not in self._pending_requests:
+            method, request_time, source_page = pending
+            captured_request = self._capture_request(request, method, request_time)
+            if captured_request is None:
                 return
-            
-            captured_request, source_page = self._pending_requests.pop(request_id)
+            url = captured_request.url
             
             # Get response body
             body = None
             try:
-                body = await response.text()
-            except Exception:
-                try:
-                    body_bytes = await response.body()
+                body_bytes = await response.body()
+                # Decoding multi-MB payloads would stall every other page's handlers
+                if len(body_bytes) > THREADED_DECODE_BYTES:
+                    body = await asyncio.to_thread(body_bytes.decode, "utf-8", "replace")
+                else:
                     body = body_bytes.decode("utf-8", errors="replace")
-                except Exception:
-                    pass
+            except Exception:
+                pass
             
-            # Capture response headers
-            headers = dict(response.headers)
+            # Capture response headers (already a fresh dict, see _capture_request)
+            headers = response.headers
             
-            captured_response = CapturedResponse(
+            captured_response = CapturedResponse.model_construct(
                 status_code=response.status,
                 headers=headers,
                 body=body,
-                timestamp=datetime.now(),
+                timestamp=response_time,
             )
             
-            endpoint = CapturedEndpoint(
+            endpoint = CapturedEndpoint.model_construct(
                 request=captured_request,
                 response=captured_response,
                 source_page=source_page,
@@ -310,11 +522,12 @@ class APIInterceptor:
             self.captured_endpoints.append(endpoint)
             
             status_color = "green" if 200 <= response.status < 300 else "yellow" if response.status < 400 else "red"
-            console.print(f"  [dim {status_color}]← {response.status}[/] [dim]{self._truncate_url(url)}[/]")
+            self._log(f"  [dim {status_color}]← {response.status}[/] [dim]{self._truncate_url(url)}[/]")
         
         # Attach listeners
         page.on("request", handle_request)
         page.on("response", handle_response)
+        page.on("requestfailed", handle_request_failed)
     
     def _truncate_url(self, url: str, max_len: int = 80) -> str:
         """Truncate URL for display."""
@@ -330,3 +543,4 @@ class APIInterceptor:
         """Clear captured endpoints."""
         self.captured_endpoints.clear()
         self._pending_requests.clear()
+        self._log_batch.clear()
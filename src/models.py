@@ -4,14 +4,41 @@ from __future__ import annotations
 
 import hashlib
 import json
+import re
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any, Optional
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import SplitResult, urlparse, urlsplit, parse_qs
 
 from pydantic import BaseModel, Field, computed_field
 
 
+# UUIDs, numeric IDs and MongoDB ObjectIds (24 hex chars), matched in one pass
+ID_SEGMENT_RE = re.compile(
+    r"(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+|[0-9a-f]{24})\Z",
+    re.I,
+)
+
+def split_url(url: str) -> SplitResult:
+    """Split a URL with urlsplit, keeping urlparse's path (no ;params on the last segment)."""
+    parts = urlsplit(url)
+    if ";" in parts.path:
+        parts = parts._replace(path=urlparse(url).path)
+    return parts
+
+
+# Other ID shapes recognised by CapturedEndpoint._normalize_path
+ALNUM_ID_RE = re.compile(r'[0-9A-Z]{5,10}$')
+PREFIXED_ID_RE = re.compile(r'(PD_|DEV_|ID_|SN_|DEVICE_)?[A-Z]{0,3}[A-Z0-9]{6,}$', re.I)
+SHORT_HEX_ID_RE = re.compile(r'[0-9a-f]{6,12}$', re.I)
+BASE64_ID_RE = re.compile(r'[A-Za-z0-9_-]{20,}$')
+SLUG_ID_RE = re.compile(r'[a-z]+[-_]\d+$', re.I)
+SLUG_ID_SUFFIX_RE = re.compile(r'[-_]\d+$')
+DIGIT_RE = re.compile(r'\d')
+UPPER_RE = re.compile(r'[A-Z]')
+
+
 class HttpMethod(str, Enum):
     GET = "GET"
     POST = "POST"
@@ -32,6 +59,26 @@ class ContentType(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Content-Type media types (before any ";" parameters) mapped directly; these
+# give the same result as the substring checks in the content_type fields
+REQUEST_CONTENT_TYPES = {
+    "application/json": ContentType.JSON,
+    "application/x-www-form-urlencoded": ContentType.FORM,
+    "multipart/form-data": ContentType.MULTIPART,
+    "application/xml": ContentType.XML,
+    "text/xml": ContentType.XML,
+}
+RESPONSE_CONTENT_TYPES = {
+    "application/json": ContentType.JSON,
+    "application/xml": ContentType.XML,
+    "text/xml": ContentType.XML,
+    "text/html": ContentType.HTML,
+    "text/plain": ContentType.TEXT,
+    "text/css": ContentType.TEXT,
+    "text/javascript": ContentType.TEXT,
+}
+
+
 class ParameterLocation(str, Enum):
     PATH = "path"
     QUERY = "query"
@@ -109,9 +156,9 @@ class CapturedRequest(BaseModel):
     body_params: dict[str, Any] = Field(default_factory=dict)
     
     @computed_field
-    @property
+    @cached_property
     def parsed_url(self) -> dict:
-        parsed = urlparse(self.url)
+        parsed = split_url(self.url)
         return {
             "scheme": parsed.scheme,
             "host": parsed.netloc,
@@ -120,9 +167,15 @@ class CapturedRequest(BaseModel):
         }
     
     @computed_field
-    @property
+    @cached_property
     def content_type(self) -> ContentType:
-        ct = self.headers.get("content-type", "").lower()
+        header = self.headers.get("content-type", "")
+        # Common media types resolve with one lookup; anything else (vendor
+        # +json types, odd casing) falls through to the substring checks
+        known = REQUEST_CONTENT_TYPES.get(header.partition(";")[0])
+        if known is not None:
+            return known
+        ct = header.lower()
         if "json" in ct:
             return ContentType.JSON
         elif "form-urlencoded" in ct:
@@ -153,9 +206,13 @@ class CapturedResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
     
     @computed_field
-    @property
+    @cached_property
     def content_type(self) -> ContentType:
-        ct = self.headers.get("content-type", "").lower()
+        header = self.headers.get("content-type", "")
+        known = RESPONSE_CONTENT_TYPES.get(header.partition(";")[0])
+        if known is not None:
+            return known
+        ct = header.lower()
         if "json" in ct:
             return ContentType.JSON
         elif "xml" in ct:
@@ -175,19 +232,19 @@ class CapturedEndpoint(BaseModel):
     source_page: str = ""  # URL of the page that made this request
     
     @computed_field
-    @property
+    @cached_property
     def endpoint_id(self) -> str:
         """Unique identifier for this endpoint pattern."""
         # Normalize path by replacing likely IDs with placeholders
         path = self.request.parsed_url["path"]
         normalized = self._normalize_path(path)
         key = f"{self.request.method}:{normalized}"
-        return hashlib.md5(key.encode()).hexdigest()[:12]
+        # 6-byte BLAKE2b gives the same 12 hex chars as the truncated MD5 did, for less work
+        return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
     
     @staticmethod
     def _normalize_path(path: str) -> str:
         """Replace IDs and UUIDs in path with placeholders."""
-        import re
         parts = path.split("/")
         normalized = []
         
@@ -196,38 +253,32 @@ class CapturedEndpoint(BaseModel):
                 normalized.append(part)
                 continue
             
-            # UUID pattern (standard format)
-            if re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', part, re.I):
-                normalized.append("{id}")
-            # Numeric ID (pure digits)
-            elif re.match(r'^\d+$', part):
-                normalized.append("{id}")
-            # MongoDB ObjectId (24 hex chars)
-            elif re.match(r'^[0-9a-f]{24}$', part, re.I):
+            # UUID, numeric ID or MongoDB ObjectId
+            if ID_SEGMENT_RE.match(part):
                 normalized.append("{id}")
             # Alphanumeric ID patterns (like 02V1TCA, 03XXDCD)
             # - Mix of digits and uppercase letters, 5-10 chars
             # - Not a common word (has digits mixed in)
-            elif re.match(r'^[0-9A-Z]{5,10}$', part) and re.search(r'\d', part) and re.search(r'[A-Z]', part):
+            elif ALNUM_ID_RE.match(part) and DIGIT_RE.search(part) and UPPER_RE.search(part):
                 normalized.append("{id}")
             # Prefixed device/serial IDs (like PD_KYVFC6Y00955, DEV_12345)
             # - Starts with prefix like PD_, DEV_, ID_, SN_
             # - Followed by alphanumeric identifier
-            elif re.match(r'^(PD_|DEV_|ID_|SN_|DEVICE_)?[A-Z]{0,3}[A-Z0-9]{6,}$', part, re.I):
-                if re.search(r'\d', part):  # Must have at least one digit
+            elif PREFIXED_ID_RE.match(part):
+                if DIGIT_RE.search(part):  # Must have at least one digit
                     normalized.append("{id}")
                 else:
                     normalized.append(part)
             # Short hex-like IDs (6-12 chars, alphanumeric)
-            elif re.match(r'^[0-9a-f]{6,12}$', part, re.I):
+            elif SHORT_HEX_ID_RE.match(part):
                 normalized.append("{id}")
             # Base64-like IDs (alphanumeric with possible - or _)
-            elif re.match(r'^[A-Za-z0-9_-]{20,}$', part) and not part.islower():
+            elif BASE64_ID_RE.match(part) and not part.islower():
                 normalized.append("{id}")
             # Slug with ID pattern (e.g., "user-123", "item_456")
-            elif re.match(r'^[a-z]+-\d+$', part, re.I) or re.match(r'^[a-z]+_\d+$', part, re.I):
+            elif SLUG_ID_RE.match(part):
                 # Extract the prefix and replace number
-                prefix = re.sub(r'[-_]\d+$', '', part)
+                prefix = SLUG_ID_SUFFIX_RE.sub('', part)
                 normalized.append(f"{prefix}_{{id}}")
             else:
                 normalized.append(part)
@@ -264,6 +315,14 @@ class EndpointGroup(BaseModel):
         return f"{method}Root"
 
 
+# API URLs never worth capturing unless the user overrides exclude_patterns
+DEFAULT_EXCLUDE_PATTERNS = (
+    r".*\.(png|jpg|jpeg|gif|svg|ico|css|js|woff|woff2|ttf|eot)(\?.*)?$",
+    r".*/sockjs-node/.*",
+    r".*/hot-update\.json$",
+)
+
+
 class CrawlConfig(BaseModel):
     """Configuration for the crawl session."""
     
@@ -275,20 +334,26 @@ class CrawlConfig(BaseModel):
     password_field: Optional[str] = None
     auth_headers: dict[str, str] = Field(default_factory=dict)
     cookies: dict[str, str] = Field(default_factory=dict)
+    session_file: Optional[str] = None  # Browser storage state reused across runs
     max_pages: int = 50
     max_depth: int = 3
-    wait_time: int = 2000
+    wait_time: int = 2000  # Max ms to wait after page load for the network to go idle
+    concurrency: int = 1  # Number of pages crawled in parallel
     headless: bool = True
     output_dir: str = "./api-docs"
     output_format: str = "both"  # openapi, markdown, both
+    snapshot_format: str = "jpeg"  # jpeg, png
+    snapshot_quality: int = 70  # JPEG quality (ignored for png)
+    
+    # Resource types aborted at the network layer (stylesheets are kept so
+    # element visibility checks still reflect the real layout)
+    blocked_resource_types: list[str] = Field(default_factory=lambda: ["image", "font", "media"])
     
     # Filtering
     include_patterns: list[str] = Field(default_factory=list)
-    exclude_patterns: list[str] = Field(default_factory=lambda: [
-        r".*\.(png|jpg|jpeg|gif|svg|ico|css|js|woff|woff2|ttf|eot)(\?.*)?$",
-        r".*/sockjs-node/.*",
-        r".*/hot-update\.json$",
-    ])
+    exclude_patterns: list[str] = Field(default_factory=lambda: list(DEFAULT_EXCLUDE_PATTERNS))
+    # Pages the crawler never navigates to; exclude_patterns only filters captured API calls
+    exclude_page_patterns: list[str] = Field(default_factory=list)
 
 
 class CrawlResult(BaseModel):
@@ -0,0 +1,104 @@
+"""Tests for the crawler's URL helpers."""
+
+from urllib.parse import urlparse
+
+import pytest
+
+from src.crawler import Crawler, normalize_url, url_digest
+from src.models import CrawlConfig
+
+
+def baseline_normalize_url(url: str) -> str:
+    """The original urlparse-based normalization the fast path must match."""
+    parsed = urlparse(url)
+    normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        params = sorted(parsed.query.split("&"))
+        normalized += "?" + "&".join(params)
+    return normalized.rstrip("/")
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com",
+    "https://example.com/",
+    "https://example.com/users/",
+    "https://example.com/users#section",
+    "https://example.com/users?b=2&a=1",
+    "https://example.com/users?b=2&a=1#frag",
+    "https://example.com/users?single=1",
+    "https://example.com/users/?",
+    "https://example.com/a;params?x=1",
+    "https://example.com/a;b/c",
+    "http://example.com:8080/path?z&y=&x=3",
+    "HTTPS://Example.com/Path?q=1",
+    "ftp://example.com/file/",
+    "https://example.com/search?q=a#b?c=d",
+    "https://example.com/?",
+    "https://example.com/#/route?x=1",
+])
+def test_normalize_url_matches_baseline(url):
+    assert normalize_url(url) == baseline_normalize_url(url)
+
+
+def test_normalize_url_dedupes_fragments_and_query_order():
+    assert normalize_url("https://example.com/a?y=2&x=1#top") == normalize_url("https://example.com/a?x=1&y=2")
+
+
+def test_url_digest_is_fixed_size_and_stable():
+    assert len(url_digest("https://example.com/a")) == 8
+    assert url_digest("https://example.com/a") == url_digest("https://example.com/a")
+    assert url_digest("https://example.com/a") != url_digest("https://example.com/b")
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    return Crawler(CrawlConfig(start_url="https://example.com/app", output_dir=str(tmp_path)))
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com",
+    "https://example.com/",
+    "https://example.com/other/page",
+    "https://example.com?x=1",
+    "https://example.com#top",
+    "http://example.com/plain-http",
+    "https://example.com.evil.net/",
+    "https://example.com:8443/",
+    "https://sub.example.com/",
+    "https://evil.net/https://example.com/",
+    "mailto:someone@example.com",
+    "javascript:void(0)",
+    "/relative/path",
+])
+def test_is_same_origin_matches_netloc_comparison(crawler, url):
+    assert crawler._is_same_origin(url) == (urlparse(url).netloc == "example.com")
+
+
+def test_should_visit_skips_assets_and_visited_pages(crawler):
+    assert crawler._should_visit("https://example.com/dashboard")
+    assert not crawler._should_visit("https://example.com/logo.PNG")
+    assert not crawler._should_visit("https://other.com/dashboard")
+    
+    crawler.visited_urls.add(url_digest(normalize_url("https://example.com/dashboard")))
+    assert not crawler._should_visit("https://example.com/dashboard/#tab")
+
+
+def test_exclude_page_patterns_only_limit_pages(tmp_path):
+    config = CrawlConfig(
+        start_url="https://example.com/",
+        output_dir=str(tmp_path),
+        exclude_patterns=[r".*/analytics.*"],
+        exclude_page_patterns=[r"https://example.com/admin.*"],
+    )
+    crawler = Crawler(config)
+    assert crawler._should_visit("https://example.com/analytics/overview")
+    assert not crawler._should_visit("https://example.com/admin/users")
+
+
+def test_enqueue_queues_each_normalized_url_once(crawler):
+    crawler._enqueue("https://example.com/a?y=2&x=1", 1)
+    crawler._enqueue("https://example.com/a?x=1&y=2#frag", 1)
+    crawler._enqueue("https://example.com/b", 0)
+    assert crawler._queue_size() == 2
+    # Shallower pages come out first
+    assert crawler._dequeue() == ("https://example.com/b", 0)
@@ -0,0 +1,81 @@
+"""Tests for the interceptor's pattern and signature helpers."""
+
+import re
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.interceptor import api_signature, compile_pattern_union, literal_prefixes, query_keys
+from src.models import DEFAULT_EXCLUDE_PATTERNS
+
+
+def baseline_api_signature(method: str, url: str) -> str:
+    """The original per-pattern re.sub signature api_signature must match."""
+    parsed = urlparse(url)
+    path = parsed.path
+    path = re.sub(r'/\d+(?=/|$)', '/{id}', path)
+    path = re.sub(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)', '/{uuid}', path, flags=re.I)
+    path = re.sub(r'/[0-9a-f]{24}(?=/|$)', '/{objectid}', path, flags=re.I)
+    keys = sorted(parse_qs(parsed.query).keys())
+    return f"{method}:{parsed.netloc}{path}:{','.join(keys)}"
+
+
+@pytest.mark.parametrize("url", [
+    "https://api.example.com/v1/users",
+    "https://api.example.com/v1/users/123",
+    "https://api.example.com/v1/users/123/orders/456",
+    "https://api.example.com/v1/users/123abc",
+    "https://api.example.com/items/550e8400-e29b-41d4-a716-446655440000",
+    "https://api.example.com/items/550E8400-E29B-41D4-A716-446655440000/",
+    "https://api.example.com/docs/507f1f77bcf86cd799439011",
+    "https://api.example.com/search?q=x&page=2&empty=",
+    "https://api.example.com/search?b=1&a=2&b=3",
+    "https://api.example.com/search?na%6De=1&with+space=2",
+    "https://api.example.com/a;v=1/b;x=2",
+    "https://api.example.com/graphql?",
+])
+def test_api_signature_matches_baseline(url):
+    assert api_signature("GET", url) == baseline_api_signature("GET", url)
+
+
+@pytest.mark.parametrize("query", ["", "a=1", "b=&a=1", "a=1&a=2&c=3", "x+y=1&z%20w=2", "flag", "=1"])
+def test_query_keys_matches_parse_qs(query):
+    assert query_keys(query) == sorted(parse_qs(query).keys())
+
+
+def test_compile_pattern_union_matches_any_pattern():
+    assert compile_pattern_union([]) is None
+    union = compile_pattern_union(list(DEFAULT_EXCLUDE_PATTERNS))
+    urls = [
+        "https://example.com/app.js",
+        "https://example.com/style.css?v=2",
+        "https://example.com/sockjs-node/info",
+        "https://example.com/main.hot-update.json",
+        "https://example.com/api/users",
+    ]
+    for url in urls:
+        expected = any(re.match(p, url) for p in DEFAULT_EXCLUDE_PATTERNS)
+        assert bool(union.match(url)) == expected
+
+
+def test_literal_prefixes_only_for_plain_prefix_patterns():
+    patterns = [
+        "https://example.com/admin.*",
+        "^https://example.com/logout",
+        r".*\.png$",
+        "https://example.com/(a|b)",
+    ]
+    assert literal_prefixes(patterns) == ("https://example.com/admin", "https://example.com/logout")
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/admin",
+    "https://example.com/admin/users",
+    "https://example.com/logout?next=/",
+    "https://example.com/administer",
+])
+def test_literal_prefix_implies_pattern_match(url):
+    patterns = ["https://example.com/admin.*", "^https://example.com/logout"]
+    union = compile_pattern_union(patterns)
+    if url.startswith(literal_prefixes(patterns)):
+        assert union.match(url)
@@ -0,0 +1,84 @@
+"""Tests for URL splitting and path ID normalization in the models."""
+
+import re
+from urllib.parse import urlparse
+
+import pytest
+
+from src.models import CapturedEndpoint, ID_SEGMENT_RE, split_url
+
+
+def baseline_normalize_path(path: str) -> str:
+    """The original per-segment re.match chain _normalize_path must match."""
+    normalized = []
+    for part in path.split("/"):
+        if not part:
+            normalized.append(part)
+        elif re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', part, re.I):
+            normalized.append("{id}")
+        elif re.match(r'^\d+$', part):
+            normalized.append("{id}")
+        elif re.match(r'^[0-9a-f]{24}$', part, re.I):
+            normalized.append("{id}")
+        elif re.match(r'^[0-9A-Z]{5,10}$', part) and re.search(r'\d', part) and re.search(r'[A-Z]', part):
+            normalized.append("{id}")
+        elif re.match(r'^(PD_|DEV_|ID_|SN_|DEVICE_)?[A-Z]{0,3}[A-Z0-9]{6,}$', part, re.I):
+            normalized.append("{id}" if re.search(r'\d', part) else part)
+        elif re.match(r'^[0-9a-f]{6,12}$', part, re.I):
+            normalized.append("{id}")
+        elif re.match(r'^[A-Za-z0-9_-]{20,}$', part) and not part.islower():
+            normalized.append("{id}")
+        elif re.match(r'^[a-z]+-\d+$', part, re.I) or re.match(r'^[a-z]+_\d+$', part, re.I):
+            prefix = re.sub(r'[-_]\d+$', '', part)
+            normalized.append(f"{prefix}_{{id}}")
+        else:
+            normalized.append(part)
+    return "/".join(normalized)
+
+
+@pytest.mark.parametrize("path", [
+    "/",
+    "/api/users",
+    "/api/users/12345",
+    "/api/items/550e8400-e29b-41d4-a716-446655440000",
+    "/api/docs/507f1f77bcf86cd799439011",
+    "/Device/Detail/PD_KYVFC6Y00955",
+    "/devices/02V1TCA/status",
+    "/devices/DEV_12345",
+    "/devices/SETTINGS",
+    "/files/deadbeef",
+    "/tokens/AbCdEfGhIjKlMnOpQrStUv",
+    "/tokens/all-lowercase-segment-name",
+    "/users/user-123/items/item_456",
+    "/api/v2/reports/",
+    "//double//slashes",
+])
+def test_normalize_path_matches_baseline(path):
+    assert CapturedEndpoint._normalize_path(path) == baseline_normalize_path(path)
+
+
+@pytest.mark.parametrize("segment, is_id", [
+    ("123", True),
+    ("550e8400-e29b-41d4-a716-446655440000", True),
+    ("507f1f77bcf86cd799439011", True),
+    ("507f1f77bcf86cd79943901", False),  # 23 hex chars
+    ("users", False),
+    ("12a", False),
+])
+def test_id_segment_re(segment, is_id):
+    assert bool(ID_SEGMENT_RE.match(segment)) == is_id
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/a/b?x=1#frag",
+    "https://example.com/a;p=1/b;q=2?x=1",
+    "https://example.com/a;p=1",
+    "http://user:pw@example.com:8080/path",
+])
+def test_split_url_keeps_urlparse_path(url):
+    parts = split_url(url)
+    parsed = urlparse(url)
+    assert parts.path == parsed.path
+    assert (parts.scheme, parts.netloc, parts.query, parts.fragment) == (
+        parsed.scheme, parsed.netloc, parsed.query, parsed.fragment
+    )
@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import os
+import re
 import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from weakref import WeakKeyDictionary
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
 
 # Add parent directory to path for imports
@@ -28,33 +32,55 @@ from src.config_manager import save_profile, load_profile, list_profiles, delete
 app = FastAPI(title="API Endpoint Hunter")
 
 # Store active crawl state
-crawl_state = {
-    "running": False,
-    "progress": [],
-    "result": None,
-    "endpoints": [],
-    "waiting_for_2fa": False,
-    "2fa_code": None,
-    "2fa_event": None,
-    "crawl_task": None,  # Track the background task
-    "snapshots": [],  # List of snapshot info
-}
+@dataclass(slots=True)
+class CrawlState:
+    running: bool = False
+    progress: list = field(default_factory=list)
+    result: Optional[object] = None
+    endpoints: list = field(default_factory=list)
+    endpoints_json: str = "[]"  # endpoints serialized once per crawl
+    waiting_for_2fa: bool = False
+    two_fa_code: Optional[str] = None
+    two_fa_event: Optional[asyncio.Event] = None
+    crawl_task: Optional[asyncio.Task] = None  # Track the background task
+    snapshots: list = field(default_factory=list)  # List of snapshot info
+    # Serializes start/stop so a stop that is still cancelling can't overlap a new crawl
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+crawl_state = CrawlState()
 
 # Store record mode state
-record_state = {
-    "recording": False,
-    "browser": None,
-    "context": None,
-    "page": None,
-    "captured_endpoints": [],  # Raw captured
-    "endpoint_groups": {},  # Grouped by pattern with user edits
-    "task": None,
-}
+@dataclass(slots=True)
+class RecordState:
+    recording: bool = False
+    browser: Optional[object] = None
+    context: Optional[object] = None
+    page: Optional[object] = None
+    captured_endpoints: list = field(default_factory=list)  # Raw captured
+    endpoint_groups: dict = field(default_factory=dict)  # Grouped by pattern with user edits
+    task: Optional[asyncio.Task] = None
+    start_url: Optional[str] = None  # URL the current session was started on
+
+
+record_state = RecordState()
+
+# Generated docs live next to the repo root; compute the paths once
+DOCS_DIR = Path(__file__).parent.parent / "api-docs"
+OPENAPI_PATH = DOCS_DIR / "openapi.yaml"
+MARKDOWN_PATH = DOCS_DIR / "api-docs.md"
 
 # Serve snapshots directory
-snapshots_dir = Path(__file__).parent.parent / "api-docs" / "snapshots"
+snapshots_dir = DOCS_DIR / "snapshots"
 snapshots_dir.mkdir(parents=True, exist_ok=True)
 
+# The UI page is static, so read it once; set DEV_RELOAD=1 to re-read on every request
+INDEX_HTML_PATH = Path(__file__).parent / "index.html"
+INDEX_HTML = INDEX_HTML_PATH.read_bytes()
+INDEX_HTML_ETAG = f'"{hashlib.blake2b(INDEX_HTML, digest_size=8).hexdigest()}"'
+# Revalidate every load so UI changes show up, but reloads of the same page get a 304
+INDEX_HTML_HEADERS = {"Cache-Control": "no-cache", "ETag": INDEX_HTML_ETAG}
+
 
 class CrawlRequest(BaseModel):
     url: str
@@ -68,6 +94,7 @@ class CrawlRequest(BaseModel):
     max_pages: int = 50
     max_depth: int = 3
     wait_time: int = 2000
+    concurrency: int = 1
     headless: bool = True
 
 
@@ -93,136 +120,282 @@ class EndpointEditRequest(BaseModel):
     skip: bool = False
 
 
-# WebSocket connections for live updates
-connected_clients: list[WebSocket] = []
+# WebSocket connections for live updates, each with its own bounded send
+# queue drained by a writer task, so a slow client never blocks the crawl
+CLIENT_QUEUE_SIZE = 64
+CLIENT_SEND_TIMEOUT = 10.0  # Seconds before a stuck send gets the client dropped
+# Weak keys mean a socket whose handler died without cleanup can't linger here
+client_queues: WeakKeyDictionary[WebSocket, asyncio.Queue] = WeakKeyDictionary()
+
+
+def _encode_message(message) -> str:
+    """Serialize a message the way WebSocket.send_json does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
 
 
 async def broadcast(message: dict):
     """Send message to all connected clients."""
-    print(f"Broadcasting to {len(connected_clients)} clients: {message.get('type', 'unknown')}")
-    disconnected = []
-    for client in connected_clients:
+    broadcast_nowait(message)
+
+
+def broadcast_nowait(message: dict):
+    """Queue a message for all clients without awaiting; call on the loop thread."""
+    if not client_queues:
+        return  # Nobody is watching (e.g. no browser open); skip the encode
+    print(f"Broadcasting to {len(client_queues)} clients: {message.get('type', 'unknown')}")
+    # Serialize once and hand the payload to every client's queue
+    broadcast_payload(_encode_message(message))
+
+
+def broadcast_payload(payload: str):
+    """Queue an already-serialized message for all connected clients."""
+    # Snapshot the queues; clients may connect or disconnect while we enqueue
+    for queue in list(client_queues.values()):
         try:
-            await client.send_json(message)
-        except Exception as e:
-            print(f"Failed to send to client: {e}")
-            disconnected.append(client)
-    
-    # Remove disconnected clients
-    for client in disconnected:
-        if client in connected_clients:
-            connected_clients.remove(client)
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Client isn't keeping up; drop its oldest pending message
+            queue.get_nowait()
+            queue.put_nowait(payload)
+
+
+async def _client_writer(websocket: WebSocket, queue: asyncio.Queue):
+    """Send queued payloads to one client until it goes away."""
+    try:
+        while True:
+            payload = await queue.get()
+            await asyncio.wait_for(websocket.send_text(payload), CLIENT_SEND_TIMEOUT)
+    except asyncio.CancelledError:
+        raise
+    except asyncio.TimeoutError:
+        print(f"Dropping client: send stalled for {CLIENT_SEND_TIMEOUT:.0f}s")
+        await _drop_client(websocket, code=1008)
+    except Exception as e:
+        print(f"Failed to send to client: {e}")
+        await _drop_client(websocket, code=1011)
+
+
+async def _drop_client(websocket: WebSocket, code: int):
+    """Stop broadcasting to a client and close its socket so the UI reconnects."""
+    client_queues.pop(websocket, None)
+    # A timed-out send may have left a partial frame; the socket can't be reused
+    try:
+        await websocket.close(code=code)
+    except Exception:
+        pass  # Already closed or the transport is gone
+
+
+# Counters (captured endpoints) are coalesced into one "progress" message per
+# window; per-page "page" events carry a log line each and are sent as-is
+PROGRESS_FLUSH_INTERVAL = 0.05
+_pending_progress: dict = {}
+_sent_progress: dict = {}  # Last value broadcast for each progress field
+_progress_task: Optional[asyncio.Task] = None
+
+
+def enqueue_progress(update: dict):
+    """Merge a progress update and schedule a flush if none is pending."""
+    global _progress_task
+    # Most pages find no new endpoints; an unchanged count alone isn't worth a message
+    if (
+        update.keys() == {"count"}
+        and "count" not in _pending_progress
+        and _sent_progress.get("count") == update["count"]
+    ):
+        return
+    _pending_progress.update(update)
+    if _progress_task is None or _progress_task.done():
+        _progress_task = asyncio.create_task(_flush_progress_later())
+
+
+async def _flush_progress_later():
+    await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+    await flush_progress()
+
+
+async def flush_progress():
+    """Broadcast any pending progress update immediately."""
+    if not _pending_progress:
+        return
+    message = {"type": "progress", **_pending_progress}
+    _sent_progress.update(_pending_progress)
+    _pending_progress.clear()
+    await broadcast(message)
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    connected_clients.append(websocket)
-    print(f"WebSocket connected. Total clients: {len(connected_clients)}")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    client_queues[websocket] = queue
+    # A new viewer hasn't seen any progress yet, so don't dedupe against older sends
+    _sent_progress.clear()
+    writer = asyncio.create_task(_client_writer(websocket, queue))
+    print(f"WebSocket connected. Total clients: {len(client_queues)}")
     try:
         while True:
-            # Keep connection alive - use ping/pong or just wait for messages
-            try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-            except asyncio.TimeoutError:
-                # Send a ping to keep the connection alive
-                await websocket.send_json({"type": "ping"})
+            # Keepalive is protocol-level PING frames sent by the server
+            # (ws_ping_interval), so just wait for messages or a disconnect
+            await websocket.receive_text()
     except WebSocketDisconnect:
         pass
     finally:
-        if websocket in connected_clients:
-            connected_clients.remove(websocket)
-        print(f"WebSocket disconnected. Total clients: {len(connected_clients)}")
+        client_queues.pop(websocket, None)
+        writer.cancel()
+        print(f"WebSocket disconnected. Total clients: {len(client_queues)}")
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index():
+async def index(request: Request):
     """Serve the main interface."""
-    html_path = Path(__file__).parent / "index.html"
-    return HTMLResponse(content=html_path.read_text())
+    if os.environ.get("DEV_RELOAD"):
+        return HTMLResponse(content=INDEX_HTML_PATH.read_bytes())
+    if request.headers.get("if-none-match") == INDEX_HTML_ETAG:
+        return Response(status_code=304, headers=INDEX_HTML_HEADERS)
+    return HTMLResponse(content=INDEX_HTML, headers=INDEX_HTML_HEADERS)
 
 
 @app.get("/api/status")
 async def get_status():
     """Get current crawl status."""
     return {
-        "running": crawl_state["running"],
-        "progress_count": len(crawl_state["progress"]),
-        "endpoints_count": len(crawl_state["endpoints"]),
+        "running": crawl_state.running,
+        "progress_count": len(crawl_state.progress),
+        "endpoints_count": len(crawl_state.endpoints),
     }
 
 
 @app.get("/api/endpoints")
 async def get_endpoints():
     """Get discovered endpoints."""
-    return crawl_state["endpoints"]
+    # Serialized once when the crawl finishes, so each request is just a copy-out
+    return Response(content=crawl_state.endpoints_json, media_type="application/json")
+
+
+# Generated docs keyed by path, holding ((mtime_ns, size), bytes, etag); a write
+# by a crawl, an export or the CLI changes the stat key and invalidates the entry
+_docs_cache: dict[Path, tuple[tuple[int, int], bytes, str]] = {}
+
+
+def _read_doc(docs_path: Path) -> tuple[bytes, str]:
+    data = docs_path.read_bytes()
+    return data, f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+
+
+async def _load_doc(docs_path: Path) -> Optional[tuple[bytes, str]]:
+    """Return (content, etag) for a generated doc, re-reading only when it changed."""
+    try:
+        st = docs_path.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _docs_cache.get(docs_path)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+    # Specs can be large; read and hash them off the event loop
+    data, etag = await asyncio.to_thread(_read_doc, docs_path)
+    _docs_cache[docs_path] = (key, data, etag)
+    return data, etag
+
+
+async def _doc_response(request: Request, docs_path: Path, media_type: str, download: int):
+    doc = await _load_doc(docs_path)
+    if doc is None:
+        return JSONResponse({"error": "No documentation generated yet"}, status_code=404)
+    data, etag = doc
+    # Always revalidate so a new crawl shows up, but let unchanged docs come back as 304
+    headers = {
+        "Cache-Control": "no-cache, must-revalidate",
+        "ETag": etag,
+    }
+    if download:
+        headers["Content-Disposition"] = f'attachment; filename="{docs_path.name}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=media_type, headers=headers)
 
 
 @app.get("/api/docs/openapi")
-async def get_openapi_doc(download: int = 0):
+async def get_openapi_doc(request: Request, download: int = 0):
     """Get the generated OpenAPI spec."""
-    docs_path = Path(__file__).parent.parent / "api-docs" / "openapi.yaml"
-    if docs_path.exists():
-        # Add headers to force download if requested and prevent caching
-        headers = {
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        }
-        if download:
-            headers["Content-Disposition"] = 'attachment; filename="openapi.yaml"'
-        return FileResponse(
-            docs_path, 
-            media_type="text/yaml", 
-            headers=headers,
-            filename="openapi.yaml" if download else None
-        )
-    return JSONResponse({"error": "No documentation generated yet"}, status_code=404)
+    return await _doc_response(request, OPENAPI_PATH, "text/yaml", download)
 
 
 @app.get("/api/docs/markdown")
-async def get_markdown_doc(download: int = 0):
+async def get_markdown_doc(request: Request, download: int = 0):
     """Get the generated Markdown doc."""
-    docs_path = Path(__file__).parent.parent / "api-docs" / "api-docs.md"
-    if docs_path.exists():
-        # Add headers to prevent caching
-        headers = {
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        }
-        if download:
-            headers["Content-Disposition"] = 'attachment; filename="api-docs.md"'
-        return FileResponse(
-            docs_path, 
-            media_type="text/markdown", 
-            headers=headers,
-            filename="api-docs.md" if download else None
-        )
-    return JSONResponse({"error": "No documentation generated yet"}, status_code=404)
+    return await _doc_response(request, MARKDOWN_PATH, "text/markdown", download)
 
 
 # Snapshot endpoints
+# Response body for index.json, keyed by its (mtime_ns, size) so polling the
+# list between crawls doesn't re-read the file
+_snapshot_index_body: Optional[tuple[tuple[int, int], bytes]] = None
+
+
+def _read_snapshot_index(index_path: Path) -> Optional[bytes]:
+    """Return index.json as a JSON array, or None if it is empty (runs in a worker thread)."""
+    data = index_path.read_bytes().strip()
+    if not data:
+        return None
+    # A whole array is spliced in as-is; anything else (e.g. a crawl killed
+    # mid-write) is rebuilt from the NDJSON log so the response stays valid JSON
+    if data.startswith(b"[") and data.endswith(b"]"):
+        return data
+    entries = []
+    try:
+        with open(index_path.with_name("index.ndjson"), "rb") as src:
+            for line in src:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # Skip a truncated last line
+    except OSError:
+        pass
+    return _encode_message(entries).encode()
+
+
 @app.get("/api/snapshots")
 async def get_snapshots():
     """Get list of all snapshots from current/last crawl."""
+    global _snapshot_index_body
     index_path = snapshots_dir / "index.json"
-    if index_path.exists():
-        with open(index_path) as f:
-            snapshots = json.load(f)
-        return {"snapshots": snapshots}
-    return {"snapshots": crawl_state.get("snapshots", [])}
+    try:
+        st = index_path.stat()
+    except FileNotFoundError:
+        return JSONResponse({"snapshots": crawl_state.snapshots})
+    key = (st.st_mtime_ns, st.st_size)
+    if _snapshot_index_body is None or _snapshot_index_body[0] != key:
+        # index.json is already a serialized JSON array, so splice it into the
+        # response as-is rather than parsing and re-encoding it
+        data = await asyncio.to_thread(_read_snapshot_index, index_path)
+        if data is None:
+            return JSONResponse({"snapshots": crawl_state.snapshots})
+        _snapshot_index_body = (key, b'{"snapshots":' + data + b'}')
+    return Response(content=_snapshot_index_body[1], media_type="application/json")
+
+
+class SnapshotFiles(StaticFiles):
+    """Serve snapshot images with conditional requests and browser caching."""
+
+    # Filenames carry the page number, time and label, so they rarely get reused
+    CACHE_CONTROL = "public, max-age=86400"
+    SUFFIXES = (".png", ".jpg", ".jpeg")
+
+    async def get_response(self, path: str, scope):
+        if not path.lower().endswith(self.SUFFIXES):
+            return JSONResponse({"error": "Snapshot not found"}, status_code=404)
+        try:
+            response = await super().get_response(path, scope)
+        except Exception:
+            return JSONResponse({"error": "Snapshot not found"}, status_code=404)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = self.CACHE_CONTROL
+        return response
 
 
-@app.get("/api/snapshots/{filename}")
-async def get_snapshot(filename: str):
-    """Get a specific snapshot image."""
-    # Sanitize filename to prevent directory traversal
-    safe_filename = Path(filename).name
-    filepath = snapshots_dir / safe_filename
-    if filepath.exists() and filepath.suffix.lower() in ('.png', '.jpg', '.jpeg'):
-        return FileResponse(filepath, media_type="image/png")
-    return JSONResponse({"error": "Snapshot not found"}, status_code=404)
+# StaticFiles handles ETag/If-None-Match (304) and streams the file itself
+app.mount("/api/snapshots", SnapshotFiles(directory=str(snapshots_dir)), name="snapshots")
 
 
 # Profile management endpoints
@@ -254,6 +427,7 @@ async def get_profile(name: str):
             "max_pages": config.max_pages,
             "max_depth": config.max_depth,
             "wait_time": config.wait_time,
+            "concurrency": config.concurrency,
             "headless": config.headless,
         }
     }
@@ -282,6 +456,7 @@ async def create_profile(request: SaveProfileRequest):
             max_pages=request.config.max_pages or 50,
             max_depth=request.config.max_depth or 3,
             wait_time=request.config.wait_time or 2000,
+            concurrency=request.config.concurrency or 1,
             headless=request.config.headless if request.config.headless is not None else True,
         )
         
@@ -303,11 +478,6 @@ async def remove_profile(name: str):
 @app.post("/api/crawl")
 async def start_crawl(request: CrawlRequest):
     """Start a new crawl."""
-    # Check if a crawl is truly running (task exists and isn't done)
-    task = crawl_state.get("crawl_task")
-    if task and not task.done():
-        return JSONResponse({"error": "A crawl is already in progress"}, status_code=400)
-    
     # Validate URL
     if not request.url:
         return JSONResponse({"error": "URL is required"}, status_code=400)
@@ -325,20 +495,28 @@ async def start_crawl(request: CrawlRequest):
             login_url = 'https://' + login_url
             request.login_url = login_url
     
-    # Reset ALL state
-    crawl_state["running"] = True
-    crawl_state["progress"] = []
-    crawl_state["result"] = None
-    crawl_state["endpoints"] = []
-    crawl_state["waiting_for_2fa"] = False
-    crawl_state["2fa_code"] = None
-    crawl_state["2fa_event"] = None
-    crawl_state["crawl_task"] = None
-    crawl_state["snapshots"] = []
-    
-    # Start crawl in background and track the task
-    task = asyncio.create_task(run_crawl(request))
-    crawl_state["crawl_task"] = task
+    async with crawl_state.lock:
+        # Check if a crawl is truly running (task exists and isn't done)
+        task = crawl_state.crawl_task
+        if task and not task.done():
+            return JSONResponse({"error": "A crawl is already in progress"}, status_code=400)
+        
+        # Reset ALL state
+        crawl_state.running = True
+        crawl_state.progress = []
+        crawl_state.result = None
+        crawl_state.endpoints = []
+        crawl_state.endpoints_json = "[]"
+        crawl_state.waiting_for_2fa = False
+        crawl_state.two_fa_code = None
+        crawl_state.two_fa_event = None
+        crawl_state.crawl_task = None
+        crawl_state.snapshots = []
+        _sent_progress.clear()
+        
+        # Start crawl in background and track the task
+        task = asyncio.create_task(run_crawl(request))
+        crawl_state.crawl_task = task
     
     return {"status": "started"}
 
@@ -346,25 +524,26 @@ async def start_crawl(request: CrawlRequest):
 @app.post("/api/stop")
 async def stop_crawl():
     """Stop the current crawl."""
-    crawl_state["running"] = False
-    
-    # Clear 2FA state - this unblocks any waiting 2FA request
-    crawl_state["waiting_for_2fa"] = False
-    if crawl_state.get("2fa_event"):
-        crawl_state["2fa_event"].set()  # Unblock any waiting code
-    crawl_state["2fa_code"] = None
-    crawl_state["2fa_event"] = None
-    
-    # Cancel the task if it exists
-    task = crawl_state.get("crawl_task")
-    if task and not task.done():
-        task.cancel()
-        try:
-            await asyncio.wait_for(task, timeout=5.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            pass
-    
-    crawl_state["crawl_task"] = None
+    async with crawl_state.lock:
+        crawl_state.running = False
+        
+        # Clear 2FA state - this unblocks any waiting 2FA request
+        crawl_state.waiting_for_2fa = False
+        if crawl_state.two_fa_event:
+            crawl_state.two_fa_event.set()  # Unblock any waiting code
+        crawl_state.two_fa_code = None
+        crawl_state.two_fa_event = None
+        
+        # Cancel the task if it exists
+        task = crawl_state.crawl_task
+        if task and not task.done():
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout=5.0)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        
+        crawl_state.crawl_task = None
     await broadcast({"type": "stopped"})
     return {"status": "stopped"}
 
@@ -376,21 +555,21 @@ class TwoFACode(BaseModel):
 @app.post("/api/2fa")
 async def submit_2fa_code(data: TwoFACode):
     """Submit a 2FA code."""
-    if not crawl_state["waiting_for_2fa"]:
+    if not crawl_state.waiting_for_2fa:
         return JSONResponse({"error": "Not waiting for 2FA code"}, status_code=400)
     
-    crawl_state["2fa_code"] = data.code
-    if crawl_state["2fa_event"]:
-        crawl_state["2fa_event"].set()
+    crawl_state.two_fa_code = data.code
+    if crawl_state.two_fa_event:
+        crawl_state.two_fa_event.set()
     
     return {"status": "submitted"}
 
 
 async def request_2fa_code(prompt: str) -> str:
     """Request 2FA code from the web interface."""
-    crawl_state["waiting_for_2fa"] = True
-    crawl_state["2fa_code"] = None
-    crawl_state["2fa_event"] = asyncio.Event()
+    crawl_state.waiting_for_2fa = True
+    crawl_state.two_fa_code = None
+    crawl_state.two_fa_event = asyncio.Event()
     
     # Notify clients that 2FA is needed
     await broadcast({
@@ -398,15 +577,32 @@ async def request_2fa_code(prompt: str) -> str:
         "prompt": prompt,
     })
     
-    # Wait for code (with timeout)
+    # Wait for code (with timeout). wait_for rather than asyncio.timeout keeps
+    # Python 3.10 working; stop_crawl both sets the event and cancels the
+    # task, and the cancellation propagates through wait_for either way
     try:
-        await asyncio.wait_for(crawl_state["2fa_event"].wait(), timeout=300)  # 5 min timeout
+        await asyncio.wait_for(crawl_state.two_fa_event.wait(), timeout=300)  # 5 min timeout
     except asyncio.TimeoutError:
-        crawl_state["waiting_for_2fa"] = False
         return ""
+    finally:
+        crawl_state.waiting_for_2fa = False
+    
+    return crawl_state.two_fa_code or ""
+
+
+def _generate_docs(endpoint_groups, config: CrawlConfig):
+    """Render and write all documentation outputs (runs in a worker thread)."""
+    writer = DocumentationWriter(config.output_dir)
+    
+    openapi_gen = OpenAPIGenerator()
+    spec = openapi_gen.generate(endpoint_groups, config)
+    writer.write_openapi(spec)
     
-    crawl_state["waiting_for_2fa"] = False
-    return crawl_state["2fa_code"] or ""
+    md_gen = MarkdownGenerator()
+    markdown = md_gen.generate(endpoint_groups, config)
+    writer.write_markdown(markdown)
+    
+    writer.write_raw_endpoints(endpoint_groups)
 
 
 async def run_crawl(request: CrawlRequest):
@@ -430,8 +626,9 @@ async def run_crawl(request: CrawlRequest):
             max_pages=request.max_pages,
             max_depth=request.max_depth,
             wait_time=request.wait_time,
+            concurrency=request.concurrency,
             headless=request.headless,
-            output_dir=str(Path(__file__).parent.parent / "api-docs"),
+            output_dir=str(DOCS_DIR),
         )
         
         await broadcast({"type": "status", "message": f"🎯 Target: {request.url}", "phase": "init"})
@@ -440,6 +637,7 @@ async def run_crawl(request: CrawlRequest):
         crawler = Crawler(config)
         
         # Set up snapshot callback to send to UI
+        loop = asyncio.get_running_loop()
         def snapshot_callback(path: str, url: str, page_num: int):
             filename = Path(path).name
             snapshot_info = {
@@ -447,43 +645,45 @@ async def run_crawl(request: CrawlRequest):
                 "url": url,
                 "page_num": page_num,
             }
-            crawl_state["snapshots"].append(snapshot_info)
-            # Note: Can't await in sync callback, but we can use asyncio.create_task
-            asyncio.create_task(broadcast({
+            crawl_state.snapshots.append(snapshot_info)
+            # Fanout only enqueues, so no task is needed; hop onto the loop in
+            # case the callback ever fires from another thread
+            loop.call_soon_threadsafe(broadcast_nowait, {
                 "type": "snapshot",
                 "filename": filename,
                 "url": url,
                 "page_num": page_num,
-            }))
+            })
         
         crawler.set_snapshot_callback(snapshot_callback)
         
         # Clear previous snapshots
-        crawl_state["snapshots"] = []
+        crawl_state.snapshots = []
         
         # Override the crawl to send updates
         original_crawl_page = crawler._crawl_page
         
         async def crawl_page_with_updates(page, url, depth):
-            if not crawl_state["running"]:
+            if not crawl_state.running:
                 return []
             
-            await broadcast({
-                "type": "page",
-                "url": url,
-                "depth": depth,
-                "visited": len(crawler.visited_urls) + 1,
-                "max_pages": config.max_pages,
-            })
+            # Only build page events when someone is connected to see them;
+            # every page is its own log line, so these are never coalesced
+            if client_queues:
+                broadcast_nowait({
+                    "type": "page",
+                    "url": url,
+                    "depth": depth,
+                    "visited": len(crawler.visited_urls) + 1,
+                    "max_pages": config.max_pages,
+                })
             
             result = await original_crawl_page(page, url, depth)
             
             # Send captured endpoints
-            captured = crawler.interceptor.get_captured_endpoints()
-            await broadcast({
-                "type": "captured",
-                "count": len(captured),
-            })
+            if client_queues:
+                captured = crawler.interceptor.get_captured_endpoints()
+                enqueue_progress({"count": len(captured)})
             
             return result
         
@@ -492,8 +692,9 @@ async def run_crawl(request: CrawlRequest):
         # Run crawl
         await broadcast({"type": "status", "message": "🔐 Setting up authentication...", "phase": "auth"})
         result, captured_endpoints = await crawler.crawl()
+        await flush_progress()
         
-        if not crawl_state["running"]:
+        if not crawl_state.running:
             return
         
         await broadcast({"type": "status", "message": "📊 Analyzing endpoints...", "phase": "analyze"})
@@ -503,7 +704,7 @@ async def run_crawl(request: CrawlRequest):
         endpoint_groups = analyzer.analyze(captured_endpoints)
         
         # Store endpoints for UI
-        crawl_state["endpoints"] = [
+        crawl_state.endpoints = [
             {
                 "method": ep.method.value,
                 "path": ep.path_pattern,
@@ -515,25 +716,18 @@ async def run_crawl(request: CrawlRequest):
             for ep in endpoint_groups
         ]
         
-        await broadcast({
-            "type": "endpoints",
-            "data": crawl_state["endpoints"],
-        })
+        # Encode the list once and reuse it for the broadcast and /api/endpoints
+        endpoints_json = _encode_message(crawl_state.endpoints)
+        crawl_state.endpoints_json = endpoints_json
+        if client_queues:
+            print(f"Broadcasting to {len(client_queues)} clients: endpoints")
+            broadcast_payload('{"type":"endpoints","data":' + endpoints_json + '}')
         
         # Generate docs
         await broadcast({"type": "status", "message": "📝 Generating documentation...", "phase": "docs"})
         
-        writer = DocumentationWriter(config.output_dir)
-        
-        openapi_gen = OpenAPIGenerator()
-        spec = openapi_gen.generate(endpoint_groups, config)
-        writer.write_openapi(spec)
-        
-        md_gen = MarkdownGenerator()
-        markdown = md_gen.generate(endpoint_groups, config)
-        writer.write_markdown(markdown)
-        
-        writer.write_raw_endpoints(endpoint_groups)
+        # Rendering and writing are blocking; keep the loop free for UI clients
+        await asyncio.to_thread(_generate_docs, endpoint_groups, config)
         
         # Complete
         await broadcast({
@@ -551,8 +745,10 @@ async def run_crawl(request: CrawlRequest):
             "message": str(e),
         })
     finally:
-        crawl_state["running"] = False
-        crawl_state["crawl_task"] = None
+        # Only clear state we still own; a newer crawl may have replaced this task
+        if crawl_state.crawl_task is asyncio.current_task():
+            crawl_state.running = False
+            crawl_state.crawl_task = None
 
 
 # ============================================================================
@@ -563,22 +759,22 @@ async def run_crawl(request: CrawlRequest):
 async def start_recording(request: RecordRequest):
     """Start record mode with a visible browser."""
     # Close any existing browser first
-    if record_state.get("browser"):
+    if record_state.browser:
         print(f"[Record Mode] Closing existing browser before starting new session")
         try:
-            await record_state["browser"].close()
+            await record_state.browser.close()
         except Exception as e:
             print(f"[Record Mode] Error closing existing browser: {e}")
-        record_state["browser"] = None
-        record_state["context"] = None
-        record_state["page"] = None
+        record_state.browser = None
+        record_state.context = None
+        record_state.page = None
     
     # Cancel any existing task
-    if record_state.get("task") and not record_state["task"].done():
+    if record_state.task and not record_state.task.done():
         print(f"[Record Mode] Cancelling existing task")
-        record_state["task"].cancel()
+        record_state.task.cancel()
         try:
-            await asyncio.wait_for(record_state["task"], timeout=2.0)
+            await asyncio.wait_for(record_state.task, timeout=2.0)
         except (asyncio.CancelledError, asyncio.TimeoutError):
             pass
     
@@ -595,16 +791,16 @@ async def start_recording(request: RecordRequest):
     print(f"[Record Mode] Starting with URL: {request.url}")
     
     # Reset state - CLEAR EVERYTHING to avoid mixing old data
-    record_state["recording"] = True
-    record_state["captured_endpoints"] = []
-    record_state["endpoint_groups"] = {}  # Clear old endpoints!
-    record_state["start_url"] = request.url  # Store the actual URL they're using
-    record_state["task"] = None
+    record_state.recording = True
+    record_state.captured_endpoints = []
+    record_state.endpoint_groups = {}  # Clear old endpoints!
+    record_state.start_url = request.url  # Store the actual URL they're using
+    record_state.task = None
     print(f"[Record Mode] Cleared all old endpoints. Starting fresh with {request.url}")
     
     # Start recording in background
     task = asyncio.create_task(run_recording(request))
-    record_state["task"] = task
+    record_state.task = task
     
     return {"status": "started", "url": request.url}
 
@@ -612,27 +808,27 @@ async def start_recording(request: RecordRequest):
 @app.post("/api/record/stop")
 async def stop_recording():
     """Stop record mode and close browser."""
-    record_state["recording"] = False
+    record_state.recording = False
     
     # Cancel the task
-    if record_state.get("task"):
-        record_state["task"].cancel()
+    if record_state.task:
+        record_state.task.cancel()
         try:
-            await asyncio.wait_for(record_state["task"], timeout=5.0)
+            await asyncio.wait_for(record_state.task, timeout=5.0)
         except (asyncio.CancelledError, asyncio.TimeoutError):
             pass
     
     # Close browser
-    if record_state.get("browser"):
+    if record_state.browser:
         try:
-            await record_state["browser"].close()
+            await record_state.browser.close()
         except:
             pass
     
-    record_state["browser"] = None
-    record_state["context"] = None
-    record_state["page"] = None
-    record_state["task"] = None
+    record_state.browser = None
+    record_state.context = None
+    record_state.page = None
+    record_state.task = None
     
     await broadcast({"type": "record_stopped"})
     return {"status": "stopped"}
@@ -641,17 +837,17 @@ async def stop_recording():
 @app.get("/api/record/endpoints")
 async def get_recorded_endpoints():
     """Get all captured endpoints during recording."""
-    endpoints = list(record_state["endpoint_groups"].values())
-    start_url = record_state.get("start_url", "NOT SET")
+    endpoints = list(record_state.endpoint_groups.values())
+    start_url = record_state.start_url or "NOT SET"
     print(f"[API] get_recorded_endpoints: returning {len(endpoints)} endpoints")
     print(f"[API] Current start_url: {start_url}")
     for ep in endpoints[:3]:  # Log first 3
         print(f"  - {ep['method']} {ep['path']} (base: {ep.get('base_url', 'N/A')})")
-    return {
+    return JSONResponse({
         "endpoints": endpoints,
         "count": len(endpoints),
         "start_url": start_url,  # Include so frontend can verify
-    }
+    })
 
 
 @app.post("/api/record/endpoint/edit")
@@ -659,10 +855,10 @@ async def edit_recorded_endpoint(request: EndpointEditRequest):
     """Edit a captured endpoint (name, description, skip)."""
     endpoint_id = request.endpoint_id
     
-    if endpoint_id not in record_state["endpoint_groups"]:
+    if endpoint_id not in record_state.endpoint_groups:
         return JSONResponse({"error": "Endpoint not found"}, status_code=404)
     
-    ep = record_state["endpoint_groups"][endpoint_id]
+    ep = record_state.endpoint_groups[endpoint_id]
     
     if request.name is not None:
         ep["name"] = request.name
@@ -685,19 +881,19 @@ async def edit_recorded_endpoint(request: EndpointEditRequest):
 async def export_recorded_docs():
     """Generate documentation from recorded endpoints."""
     print(f"[Export] ========== STARTING EXPORT ==========")
-    print(f"[Export] Record state has {len(record_state['endpoint_groups'])} endpoints")
-    start_url = record_state.get('start_url', 'NOT SET')
+    print(f"[Export] Record state has {len(record_state.endpoint_groups)} endpoints")
+    start_url = record_state.start_url or 'NOT SET'
     print(f"[Export] Start URL: {start_url}")
     
     # Warn if start_url looks like it might be from a profile
-    if start_url and 'kyocera' in start_url.lower() and len(record_state['endpoint_groups']) > 0:
+    if start_url and 'kyocera' in start_url.lower() and len(record_state.endpoint_groups) > 0:
         # Check if any endpoints have different base_urls
-        unique_base_urls = set(ep.get('base_url', '') for ep in record_state['endpoint_groups'].values())
+        unique_base_urls = set(ep.get('base_url', '') for ep in record_state.endpoint_groups.values())
         if len(unique_base_urls) > 1 or (unique_base_urls and start_url not in unique_base_urls):
             print(f"[Export] ⚠️ WARNING: start_url ({start_url}) doesn't match endpoint base_urls: {unique_base_urls}")
     
     # Get fresh copy of endpoints
-    all_endpoints = list(record_state["endpoint_groups"].values())
+    all_endpoints = list(record_state.endpoint_groups.values())
     
     if not all_endpoints:
         print("[Export] ERROR: No endpoints in record_state!")
@@ -738,7 +934,7 @@ async def export_recorded_docs():
         description = ep.get("description") or ep.get("auto_description", "")
         
         # Use the base_url from the actual recorded request, not from config
-        base_url = ep.get("base_url", record_state.get("start_url", "https://example.com"))
+        base_url = ep.get("base_url", record_state.start_url or "https://example.com")
         
         print(f"[Export] [{i}/{len(endpoints_to_export)}] {ep['method']} {ep['path']} -> base: {base_url}, name: {summary}")
         
@@ -758,11 +954,11 @@ async def export_recorded_docs():
         print(f"  - {g.method.value} {g.path_pattern} (base: {g.base_url}, summary: {g.summary})")
     
     # Generate documentation
-    output_dir = str(Path(__file__).parent.parent / "api-docs")
+    output_dir = str(DOCS_DIR)
     writer = DocumentationWriter(output_dir)
     
     # Use the start_url from record_state (the actual URL they navigated to)
-    actual_start_url = record_state.get("start_url", "https://example.com")
+    actual_start_url = record_state.start_url or "https://example.com"
     print(f"[Export] Using start_url: {actual_start_url}")
     
     # Create a minimal config for the generators
@@ -856,7 +1052,7 @@ async def run_recording(request: RecordRequest):
         print(f"[Record Mode] run_recording called with URL: {request.url}")
         await broadcast({"type": "record_status", "message": f"🚀 Launching browser for {request.url}..."})
         
-        record_state["start_url"] = request.url
+        record_state.start_url = request.url
         
         playwright = await async_playwright().start()
         
@@ -868,31 +1064,45 @@ async def run_recording(request: RecordRequest):
                 "--disable-blink-features=AutomationControlled",
             ]
         )
-        record_state["browser"] = browser
+        record_state.browser = browser
         
         # Create context
         context = await browser.new_context(
             viewport=None,  # Use full window size
             user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
         )
-        record_state["context"] = context
+        record_state.context = context
         
         # Create page
         page = await context.new_page()
-        record_state["page"] = page
+        record_state.page = page
         
         # Set up request interception
         captured_ids = set()  # Track already captured to avoid duplicates
+        # Exact (method, url) pairs already known to map to a captured endpoint,
+        # oldest first so the cap evicts the least recently added pair
+        handled_requests: dict[tuple[str, str], None] = {}
+        
+        def mark_handled(request_key: tuple[str, str]):
+            if len(handled_requests) >= RECORD_HANDLED_REQUESTS_SIZE:
+                del handled_requests[next(iter(handled_requests))]
+            handled_requests[request_key] = None
         
         async def handle_response(response):
             """Capture API responses."""
-            if not record_state["recording"]:
+            if not record_state.recording:
                 return
             
             try:
                 request = response.request
                 url = request.url
                 
+                # Polled endpoints repeat the exact same request; skip them
+                # before any parsing or filtering
+                request_key = (request.method, url)
+                if request_key in handled_requests:
+                    return
+                
                 # Skip non-API requests
                 if not _should_capture_request(url, response):
                     return
@@ -909,10 +1119,9 @@ async def run_recording(request: RecordRequest):
                 
                 # Skip if already captured this pattern
                 if endpoint_id in captured_ids:
+                    mark_handled(request_key)
                     return
                 
-                captured_ids.add(endpoint_id)
-                
                 # Get response info
                 status = response.status
                 content_type = response.headers.get("content-type", "")
@@ -943,8 +1152,11 @@ async def run_recording(request: RecordRequest):
                 }
                 
                 print(f"[Record] 📡 Captured: {method} {normalized_path} from {base_url}")
-                record_state["endpoint_groups"][endpoint_id] = endpoint_data
-                print(f"[Record] Total endpoints now: {len(record_state['endpoint_groups'])}")
+                record_state.endpoint_groups[endpoint_id] = endpoint_data
+                # Only a stored capture may suppress later repeats of this request
+                captured_ids.add(endpoint_id)
+                mark_handled(request_key)
+                print(f"[Record] Total endpoints now: {len(record_state.endpoint_groups)}")
                 
                 # Broadcast new endpoint
                 await broadcast({
@@ -960,8 +1172,8 @@ async def run_recording(request: RecordRequest):
         # Listen for responses on main page
         page.on("response", handle_response)
         
-        # Track all pages
-        all_pages = [page]
+        # Track all pages (a set: pages come and go as tabs open and close)
+        all_pages = {page}
         
         # Handle page crashes
         def handle_crash():
@@ -971,7 +1183,7 @@ async def run_recording(request: RecordRequest):
         # Handle popups/new windows - CRITICAL for sites that open links in new tabs
         async def handle_popup(popup_page):
             print(f"[Record] 📄 New popup/tab opened: {popup_page.url}")
-            all_pages.append(popup_page)
+            all_pages.add(popup_page)
             
             # Attach response handler to popup too!
             popup_page.on("response", handle_response)
@@ -983,8 +1195,7 @@ async def run_recording(request: RecordRequest):
             # Track when popup closes
             def on_close():
                 print(f"[Record] 📄 Popup closed")
-                if popup_page in all_pages:
-                    all_pages.remove(popup_page)
+                all_pages.discard(popup_page)
             popup_page.on("close", on_close)
             
             await broadcast({
@@ -999,7 +1210,7 @@ async def run_recording(request: RecordRequest):
         async def handle_new_page(new_page):
             if new_page not in all_pages:
                 print(f"[Record] 📄 New page in context: {new_page.url}")
-                all_pages.append(new_page)
+                all_pages.add(new_page)
                 new_page.on("response", handle_response)
                 new_page.on("popup", handle_popup)
         
@@ -1039,7 +1250,9 @@ async def run_recording(request: RecordRequest):
         })
         
         # Keep running until stopped
-        while record_state["recording"]:
+        last_heartbeat = None
+        quiet_ticks = 0
+        while record_state.recording:
             await asyncio.sleep(1)
             
             # Check if browser is still connected
@@ -1065,13 +1278,19 @@ async def run_recording(request: RecordRequest):
                     })
                     break
             
-            # Send heartbeat with current count and page info
-            active_count = len([p for p in all_pages if not p.is_closed()])
-            await broadcast({
-                "type": "record_heartbeat",
-                "endpoints_count": len(record_state["endpoint_groups"]),
-                "pages_count": active_count,
-            })
+            # Send heartbeat with current count and page info, but only when it
+            # changed (or periodically, so newly connected viewers catch up)
+            active_count = sum(1 for p in all_pages if not p.is_closed())
+            heartbeat = (len(record_state.endpoint_groups), active_count)
+            quiet_ticks += 1
+            if heartbeat != last_heartbeat or quiet_ticks >= RECORD_HEARTBEAT_EVERY:
+                last_heartbeat = heartbeat
+                quiet_ticks = 0
+                await broadcast({
+                    "type": "record_heartbeat",
+                    "endpoints_count": heartbeat[0],
+                    "pages_count": heartbeat[1],
+                })
         
     except asyncio.CancelledError:
         await broadcast({"type": "record_stopped"})
@@ -1079,32 +1298,45 @@ async def run_recording(request: RecordRequest):
         await broadcast({"type": "record_error", "message": str(e)})
     finally:
         # Cleanup
-        if record_state.get("browser"):
+        if record_state.browser:
             try:
-                await record_state["browser"].close()
+                await record_state.browser.close()
             except:
                 pass
-        record_state["recording"] = False
+        record_state.recording = False
+
+
+# Seconds between record-mode heartbeats when nothing has changed
+RECORD_HEARTBEAT_EVERY = 10
+
+# Cap on exact (method, url) pairs remembered per recording
+RECORD_HANDLED_REQUESTS_SIZE = 8192
+
+# Static asset extensions ignored in record mode
+RECORD_SKIP_EXTENSIONS = frozenset({
+    '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
+    '.woff', '.woff2', '.ttf', '.eot', '.map', '.html', '.htm',
+})
+
+# Common non-API paths, and common API path markers, each as one pattern
+RECORD_SKIP_PATH_RE = re.compile(r"/(?:resources/|static/|assets/|_next/|sockjs-node/|favicon|__|bundle|chunk)")
+RECORD_API_PATH_RE = re.compile(r"/(?:api/|v[123]/|rest/|graphql|query)")
 
 
 def _should_capture_request(url: str, response) -> bool:
     """Check if request should be captured as an API endpoint."""
     from urllib.parse import urlparse
-    import re
     
     parsed = urlparse(url)
     path = parsed.path.lower()
     
     # Skip static assets
-    skip_extensions = ['.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', 
-                       '.woff', '.woff2', '.ttf', '.eot', '.map', '.html', '.htm']
-    if any(path.endswith(ext) for ext in skip_extensions):
+    dot = path.rfind('.')
+    if dot != -1 and path[dot:] in RECORD_SKIP_EXTENSIONS:
         return False
     
     # Skip common non-API paths
-    skip_patterns = ['/resources/', '/static/', '/assets/', '/_next/', '/sockjs-node/', 
-                     '/favicon', '/__', '/bundle', '/chunk']
-    if any(pattern in path for pattern in skip_patterns):
+    if RECORD_SKIP_PATH_RE.search(path):
         return False
     
     # Get content type
@@ -1115,8 +1347,7 @@ def _should_capture_request(url: str, response) -> bool:
         return False
     
     # Include if it's under /api/ or common API patterns
-    api_patterns = ['/api/', '/v1/', '/v2/', '/v3/', '/rest/', '/graphql', '/query']
-    if any(pattern in path for pattern in api_patterns):
+    if RECORD_API_PATH_RE.search(path):
         print(f"[Record] ✓ Capturing (API path): {path}")
         return True
     
@@ -1243,4 +1474,12 @@ def _infer_tags(path: str) -> list:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8787)
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=8787,
+        loop="auto",  # uvloop when installed
+        ws_ping_interval=20,  # WebSocket keepalive handled by the protocol layer
+        ws_ping_timeout=20,
+        ws_per_message_deflate=True,  # Compress large endpoint-list frames on the wire
+    )